@@ -12,6 +12,8 @@ import TaskItem from './components/TaskItem';
 import TaskStats from './components/TaskStats';
 
 const API_BASE = 'http://localhost:8000/api';
+// Used only when the server cannot stream live updates
+const POLL_INTERVAL_MS = 30000;
 
 // API Service
 class ApiService {
@@ -106,6 +108,47 @@ function App() {
     fetchStats();
   }, []);
 
+  // Live updates from other tabs and clients
+  useEffect(() => {
+    const events = new EventSource(`${API_BASE}/events/`);
+
+    events.addEventListener('task.saved', (event) => {
+      const savedTask = JSON.parse(event.data);
+      setTasks(prev => prev.some(task => task.id === savedTask.id)
+        ? prev.map(task => task.id === savedTask.id ? savedTask : task)
+        : [savedTask, ...prev]);
+      fetchStats();
+    });
+
+    events.addEventListener('task.deleted', (event) => {
+      const { id } = JSON.parse(event.data);
+      setTasks(prev => prev.filter(task => task.id !== id));
+      fetchStats();
+    });
+
+    const refresh = () => {
+      fetchTasks();
+      fetchStats();
+    };
+    events.addEventListener('tasks.bulk_saved', refresh);
+    events.addEventListener('tasks.bulk_deleted', refresh);
+    events.addEventListener('resync', refresh);
+
+    // EventSource reconnects by itself after network errors, but gives up
+    // when the server refuses to stream (e.g. not running under ASGI).
+    let pollTimer = null;
+    events.onerror = () => {
+      if (events.readyState === EventSource.CLOSED && !pollTimer) {
+        pollTimer = setInterval(refresh, POLL_INTERVAL_MS);
+      }
+    };
+
+    return () => {
+      events.close();
+      clearInterval(pollTimer);
+    };
+  }, []);
+
   const fetchTasks = async () => {
     try {
       setLoading(true);
@@ -0,0 +1,93 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .events import publish_event
+from .models import ChangeCounter, Task, TaskStatsCounter, TaskTombstone
+from .signals import bulk_task_changes
+
+
+# Ids per statement; keeps IN (...) lists under SQLite's variable limit.
+BULK_CHUNK_SIZE = 500
+# Largest number of tasks accepted by a single bulk create or delete.
+BULK_MAX_TASKS = 10000
+
+
+def chunked(items, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _update_values(validated_data, now):
+    values = dict(validated_data, updated_at=now)
+    # Mirror Task.save(): completing keeps an existing completed_at and
+    # stamps the rest, reopening clears it.
+    if 'is_done' in values:
+        if values['is_done']:
+            values['completed_at'] = Case(
+                When(completed_at__isnull=True, then=Value(now)),
+                default=F('completed_at'),
+            )
+        else:
+            values['completed_at'] = None
+    return values
+
+
+def bulk_update_tasks(task_ids, validated_data):
+    """Apply validated_data to every task in task_ids.
+
+    Runs one SELECT and one UPDATE per chunk inside a single transaction
+    and returns a ``{id: 'updated' | 'not_found'}`` mapping in input order.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    values = _update_values(validated_data, timezone.now())
+    found = set()
+    with transaction.atomic():
+        values['change_seq'] = ChangeCounter.next_value()
+        for chunk in chunked(task_ids):
+            tasks = Task.objects.filter(id__in=chunk)
+            found.update(tasks.order_by().values_list('id', flat=True))
+            tasks.update(**values)
+        publish_event('tasks.bulk_saved', lambda: {'ids': sorted(found)})
+    return {task_id: 'updated' if task_id in found else 'not_found' for task_id in task_ids}
+
+
+def bulk_create_tasks(validated_data):
+    """Insert validated task dicts with batched INSERTs and return the tasks."""
+    now = timezone.now()
+    tasks = [Task(**attrs) for attrs in validated_data]
+    for task in tasks:
+        # bulk_create() bypasses Task.save().
+        if task.is_done:
+            task.completed_at = now
+    with transaction.atomic():
+        change_seq = ChangeCounter.next_value()
+        for task in tasks:
+            task.change_seq = change_seq
+        tasks = Task.objects.bulk_create(tasks, batch_size=BULK_CHUNK_SIZE)
+        publish_event('tasks.bulk_saved', lambda: {'ids': [task.id for task in tasks]})
+    return tasks
+
+
+def bulk_delete_tasks(task_ids):
+    """Delete every task in task_ids, one chunk at a time, in one transaction.
+
+    Returns a ``{id: 'deleted' | 'not_found'}`` mapping in input order.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    deleted = set()
+    with transaction.atomic(), bulk_task_changes():
+        change_seq = ChangeCounter.next_value()
+        for chunk in chunked(task_ids):
+            tasks = Task.objects.filter(id__in=chunk)
+            found = list(tasks.order_by().values_list('id', flat=True))
+            TaskStatsCounter.apply(tasks.stats_states(), Counter())
+            tasks.delete()
+            TaskTombstone.objects.bulk_create([
+                TaskTombstone(task_id=task_id, change_seq=change_seq) for task_id in found
+            ])
+            deleted.update(found)
+        publish_event('tasks.bulk_deleted', lambda: {'ids': sorted(deleted)})
+    return {task_id: 'deleted' if task_id in deleted else 'not_found' for task_id in task_ids}
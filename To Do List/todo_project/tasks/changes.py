@@ -0,0 +1,78 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Max, Q
+
+from .models import ChangeCounter, Task, TaskTombstone
+
+
+# Largest number of changed tasks (and, separately, deletions) per response.
+CHANGES_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(task_position, tombstone_position):
+    position = '|'.join(str(number) for number in (*task_position, *tombstone_position))
+    return urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        task_seq, task_id, tombstone_seq, tombstone_id = (
+            int(number) for number in urlsafe_b64decode(cursor.encode('ascii')).decode('ascii').split('|')
+        )
+    except (TypeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+    return (task_seq, task_id), (tombstone_seq, tombstone_id)
+
+
+def _after(queryset, position, high_water):
+    """Rows past the (change_seq, id) position, up to the high-water mark."""
+    change_seq, row_id = position
+    return queryset.filter(
+        Q(change_seq__gt=change_seq) | Q(change_seq=change_seq, id__gt=row_id),
+        change_seq__lte=high_water,
+    ).order_by('change_seq', 'id')
+
+
+def get_changes(cursor=None, limit=CHANGES_PAGE_SIZE):
+    """Return tasks changed and ids deleted since cursor, plus the next cursor.
+
+    Changes are ordered by the change_seq their transaction took from
+    ChangeCounter, not by a timestamp, and only read up to the counter's
+    value when the request starts. A write that commits late therefore
+    still has a number above the returned cursor instead of one below it.
+
+    Without a cursor every task is returned as changed and earlier
+    deletions are skipped, which is what a client starting from scratch
+    needs. Clients apply ``changed`` before ``deleted`` and keep requesting
+    with the returned cursor while ``has_more`` is true.
+    """
+    high_water = ChangeCounter.current_value()
+    if cursor is None:
+        task_position = (-1, 0)
+        tombstone_position = (high_water, TaskTombstone.objects.aggregate(last=Max('id'))['last'] or 0)
+    else:
+        task_position, tombstone_position = decode_cursor(cursor)
+
+    tasks = list(_after(Task.objects.select_related('category'), task_position, high_water)[:limit + 1])
+    tombstones = list(
+        _after(TaskTombstone.objects.all(), tombstone_position, high_water)
+        .values_list('change_seq', 'id', 'task_id')[:limit + 1]
+    )
+
+    has_more = len(tasks) > limit or len(tombstones) > limit
+    tasks, tombstones = tasks[:limit], tombstones[:limit]
+    if tasks:
+        task_position = (tasks[-1].change_seq, tasks[-1].id)
+    if tombstones:
+        tombstone_position = tombstones[-1][:2]
+
+    return {
+        'changed': tasks,
+        'deleted': [deleted_id for _, _, deleted_id in tombstones],
+        'cursor': encode_cursor(task_position, tombstone_position),
+        'has_more': has_more,
+    }
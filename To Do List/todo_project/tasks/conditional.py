@@ -0,0 +1,60 @@
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import md5
+from django.utils.http import quote_etag
+
+from .models import Category, ChangeCounter
+
+
+# is_overdue and days_until_due change with the clock rather than with
+# writes, so ETags of task lists also roll over every TIME_BUCKET_SECONDS.
+TIME_BUCKET_SECONDS = 60
+
+
+def make_etag(*parts):
+    return quote_etag(md5(repr(parts).encode(), usedforsecurity=False).hexdigest())
+
+
+def query_string_key(request):
+    return sorted(request.query_params.lists())
+
+
+def time_bucket(now):
+    return int(now.timestamp()) // TIME_BUCKET_SECONDS
+
+
+def task_table_version():
+    """Number of the last committed task change (see ChangeCounter).
+
+    Every task write and deletion takes a new number, so this moves on
+    whenever any task list could have changed, at the cost of one
+    primary-key lookup instead of an aggregate over the table.
+    """
+    return ChangeCounter.current_value()
+
+
+def category_table_version():
+    return sorted(Category.objects.aggregate(count=Count('id'), updated=Max('updated_at')).items())
+
+
+class ConditionalGetMixin:
+    """Answer GET with 304 Not Modified while the client's ETag still matches.
+
+    Subclasses implement get_etag(), which must be much cheaper than
+    building the response: nothing is serialized for a 304. The ETag is
+    kept on the view as ``etag`` (see CachedResponseMixin).
+    """
+
+    def get_etag(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        etag = self.etag = self.get_etag(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers.setdefault('ETag', etag)
+        # Always revalidate rather than reuse a stored copy.
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROKER = {
+    'BACKEND': 'tasks.events.InProcessBroker',
+    'OPTIONS': {},
+}
+
+# Events buffered per subscriber before it is considered too slow.
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Sent instead of the events a slow subscriber missed; the client should
+# catch up through tasks/changes/.
+RESYNC_EVENT = {'type': 'resync', 'data': {}}
+
+
+class InProcessBroker:
+    """Fans events out to the subscribers of this process.
+
+    publish() may be called from any thread; each subscriber is an
+    asyncio queue fed on the event loop that created it.
+    """
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @property
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, event):
+        self._fan_out(event)
+
+    def _fan_out(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has already been closed.
+                pass
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            event = RESYNC_EVENT
+        queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+class RedisBroker(InProcessBroker):
+    """Relays events between processes over a Redis-compatible pub/sub channel.
+
+    Each process keeps one channel subscription and fans messages out to
+    its own subscribers. ``client_factory`` is the dotted path of a
+    callable taking ``(url, use_asyncio)`` and returning a redis-py compatible
+    client, so a local stand-in can replace a real server.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', channel='tasks:events',
+                 client_factory=None, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.channel = channel
+        self._client_factory = import_string(client_factory) if client_factory else self._redis_client
+        self._client = None
+        self._listeners = {}
+
+    @property
+    def has_subscribers(self):
+        # Subscribers may live in other processes.
+        return True
+
+    @staticmethod
+    def _redis_client(url, use_asyncio=False):
+        try:
+            if use_asyncio:
+                import redis.asyncio as redis
+            else:
+                import redis
+        except ImportError:
+            raise ImproperlyConfigured('RedisBroker requires the "redis" package.')
+        return redis.Redis.from_url(url)
+
+    def publish(self, event):
+        if self._client is None:
+            self._client = self._client_factory(self.url, use_asyncio=False)
+        self._client.publish(self.channel, json.dumps(event, cls=JSONEncoder))
+
+    async def _listen(self):
+        pubsub = self._client_factory(self.url, use_asyncio=True).pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    self._fan_out(json.loads(message['data']))
+        finally:
+            await pubsub.unsubscribe(self.channel)
+
+    @asynccontextmanager
+    async def subscribe(self):
+        loop = asyncio.get_running_loop()
+        listener = self._listeners.get(loop)
+        if listener is None or listener.done():
+            self._listeners[loop] = loop.create_task(self._listen())
+        async with super().subscribe() as queue:
+            yield queue
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            config = getattr(settings, 'TASKS_EVENT_BROKER', DEFAULT_BROKER)
+            _broker = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+        return _broker
+
+
+def publish_event(event_type, build_data):
+    """Publish an event once the current transaction commits.
+
+    ``build_data`` is only called when someone may be listening.
+    """
+    broker = get_broker()
+    if not broker.has_subscribers:
+        return
+    event = {'type': event_type, 'data': build_data()}
+
+    def send():
+        try:
+            broker.publish(event)
+        except Exception:
+            logger.exception('Could not publish %s event', event_type)
+
+    transaction.on_commit(send)
+
+
+def format_event(event):
+    data = json.dumps(event['data'], cls=JSONEncoder)
+    return f"event: {event['type']}\ndata: {data}\n\n"
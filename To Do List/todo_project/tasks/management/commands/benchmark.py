@@ -0,0 +1,318 @@
+"""Time task API code paths against a throwaway database.
+
+    python manage.py benchmark stats --sizes 10000 100000 1000000
+    python manage.py benchmark search
+    python manage.py benchmark bulk --sizes 100000 --repeat 10
+    python manage.py benchmark response_cache
+    python manage.py benchmark render --sizes 10000
+    python manage.py benchmark serialize --sizes 10000
+    python manage.py benchmark due_filter --sizes 1000000
+
+The command creates a test database (the same one ``manage.py test``
+would use), fills it with generated tasks up to each size in turn and
+prints p50/p99 latencies. The configured database is never touched.
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import filters
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.bulk import bulk_create_tasks, bulk_delete_tasks
+from tasks.middleware import CompressionMiddleware
+from tasks.models import Category, Task
+from tasks.renderers import FastJSONRenderer
+from tasks.response_cache import response_cache_metrics
+from tasks.search import TaskSearchFilter
+from tasks.serializers import TASK_ROW_FIELDS, TaskSerializer, serialize_task_rows
+from tasks.stats import get_task_stats
+from tasks.views import TaskFilter, TaskListCreateView
+
+
+SEED_BATCH_SIZE = 5000
+WORDS = (
+    'write report review budget call plan meeting fix deploy email invoice '
+    'groceries dentist gym read book clean garage update docs refactor test '
+    'design sprint release backup renew insurance pay rent order parts'
+).split()
+# Descriptions also carry one of this many "clientNNNN" words, so searches
+# can be timed from very common ("wri") down to rare ("client4242") terms.
+CLIENT_WORDS = 10000
+SEARCH_TERMS = ('wri', 'client42', 'client4242')
+SEARCH_PAGE_SIZE = 20
+# Tasks created and then deleted again per timed run of the bulk suite.
+BULK_BATCH_SIZE = 200
+# Serialized tasks per page rendered by the render suite.
+RENDER_PAGE_SIZE = 100
+# Tasks per page serialized by the serialize suite.
+SERIALIZE_PAGE_SIZE = 1000
+
+
+def seed_tasks(count, rng):
+    """Add generated tasks until the table holds ``count`` rows."""
+    categories = list(Category.objects.all()) or Category.objects.bulk_create(
+        Category(name=name) for name in ('Personal', 'Work', 'Shopping', 'Health', 'Study', 'Home')
+    )
+    now = timezone.now()
+    missing = count - Task.objects.count()
+    while missing > 0:
+        batch = []
+        for _ in range(min(missing, SEED_BATCH_SIZE)):
+            is_done = rng.random() < 0.3
+            batch.append(Task(
+                title=' '.join(rng.choices(WORDS, k=3)),
+                description=(
+                    ' '.join(rng.choices(WORDS, k=12)) + f' client{rng.randrange(CLIENT_WORDS)}'
+                    if rng.random() < 0.7 else None
+                ),
+                is_done=is_done,
+                priority=rng.choice(('low', 'medium', 'high')),
+                due_date=now + timedelta(minutes=rng.randint(-90 * 1440, 90 * 1440)) if rng.random() < 0.8 else None,
+                category=rng.choice(categories + [None]),
+                completed_at=now - timedelta(minutes=rng.randint(0, 30 * 1440)) if is_done else None,
+                order=rng.randint(0, 1 << 20),
+            ))
+        Task.objects.bulk_create(batch)
+        missing -= len(batch)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[min(len(samples) - 1, round(len(samples) * 0.99))]
+
+
+def measure(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def measure_create_delete(create, delete, repeat):
+    """Time create() and then delete() of the ids it returns, ``repeat`` times."""
+    create_samples, delete_samples = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ids = create()
+        create_samples.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        delete(ids)
+        delete_samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(create_samples), percentiles(delete_samples)
+
+
+def legacy_task_stats():
+    """The five COUNT queries task_stats ran before the aggregate query."""
+    total = Task.objects.count()
+    completed = Task.objects.filter(is_done=True).count()
+    overdue = Task.objects.filter(due_date__lt=timezone.now(), is_done=False).count()
+    today = timezone.now().date()
+    today_completed = Task.objects.filter(completed_at__date=today).count()
+    week_start = today - timedelta(days=today.weekday())
+    this_week_completed = Task.objects.filter(completed_at__date__gte=week_start).count()
+    return total, completed, overdue, today_completed, this_week_completed
+
+
+def uncached_task_stats():
+    cache.clear()
+    return get_task_stats()
+
+
+def toggle_task(task):
+    """One save that moves a task between counter buckets."""
+    task.is_done = not task.is_done
+    task.save()
+
+
+def stats_suite(size, repeat):
+    get_task_stats()
+    task = Task.objects.order_by('id').first()
+    return [
+        ('five COUNT queries (before)', measure(legacy_task_stats, repeat)),
+        ('counters + due ranges, after a write', measure(uncached_task_stats, repeat)),
+        ('counters + due ranges, cached', measure(get_task_stats, repeat)),
+        ('Task.save() with counter deltas', measure(lambda: toggle_task(task), repeat)),
+    ]
+
+
+def bulk_rows():
+    return [{'title': f'bulk task {number}', 'priority': 'medium'} for number in range(BULK_BATCH_SIZE)]
+
+
+@transaction.atomic
+def create_each():
+    """What bulk creation did before: one save() per task."""
+    return [Task.objects.create(**attrs).id for attrs in bulk_rows()]
+
+
+@transaction.atomic
+def delete_each(ids):
+    for task in Task.objects.filter(id__in=ids):
+        task.delete()
+
+
+def bulk_suite(size, repeat):
+    results = []
+    for name, create, delete in (
+        ('save()/delete() per task (before)', create_each, delete_each),
+        ('bulk_create_tasks/bulk_delete_tasks', lambda: [task.id for task in bulk_create_tasks(bulk_rows())],
+         bulk_delete_tasks),
+    ):
+        create_timing, delete_timing = measure_create_delete(create, delete, repeat)
+        results += [
+            (f'create {BULK_BATCH_SIZE}, {name}', create_timing),
+            (f'delete {BULK_BATCH_SIZE}, {name}', delete_timing),
+        ]
+    return results
+
+
+def list_page(query):
+    """One rendered task list response, as a client requesting ``query`` gets it."""
+    request = APIRequestFactory(SERVER_NAME='localhost').get('/api/tasks/', query)
+    return TaskListCreateView.as_view()(request).render()
+
+
+def response_cache_suite(size, repeat):
+    results = []
+    for query in ({}, {'pagination': 'cursor', 'overdue': 'true'}):
+        uncached = measure(lambda: (cache.clear(), list_page(query)), repeat)
+        cache.clear()
+        list_page(query)
+        cached = measure(lambda: list_page(query), repeat)
+        label = '&'.join(f'{name}={value}' for name, value in query.items()) or 'first page'
+        results += [
+            (f'{label}, uncached', uncached),
+            (f"{label}, cached ({response_cache_metrics()['hit_rate']}% hits)", cached),
+        ]
+    return results
+
+
+def compress(request, body):
+    middleware = CompressionMiddleware(lambda request: HttpResponse(body, content_type='application/json'))
+    return middleware(request)
+
+
+def render_suite(size, repeat):
+    rows = Task.objects.select_related('category').order_by('order', '-created_at')[:RENDER_PAGE_SIZE]
+    page = {'next': None, 'results': serialize_task_rows(rows.values(*TASK_ROW_FIELDS))}
+    body = FastJSONRenderer().render(page)
+    results = [
+        (f'{RENDER_PAGE_SIZE} tasks, JSONRenderer (before)', measure(lambda: JSONRenderer().render(page), repeat)),
+        (f'{RENDER_PAGE_SIZE} tasks, FastJSONRenderer', measure(lambda: FastJSONRenderer().render(page), repeat)),
+    ]
+    for encoding in ('gzip', 'br'):
+        request = APIRequestFactory().get('/api/tasks/', HTTP_ACCEPT_ENCODING=encoding)
+        response = compress(request, body)
+        if response.get('Content-Encoding') != encoding:
+            continue
+        name = f'{encoding}, {len(body)} -> {len(response.content)} bytes'
+        results.append((name, measure(lambda: compress(request, body), repeat)))
+    return results
+
+
+def serialize_suite(size, repeat):
+    tasks = Task.objects.select_related('category').order_by('order', '-created_at')[:SERIALIZE_PAGE_SIZE]
+    results = []
+    for name, serialize in (
+        ('TaskSerializer (before)', lambda: TaskSerializer(tasks, many=True).data),
+        ('serialize_task_rows', lambda: serialize_task_rows(tasks.values(*TASK_ROW_FIELDS))),
+    ):
+        p50, p99 = measure(serialize, repeat)
+        results.append((f'{SERIALIZE_PAGE_SIZE} tasks, {name}, {SERIALIZE_PAGE_SIZE / p50 * 1000:,.0f} rows/s', (p50, p99)))
+    return results
+
+
+def legacy_due_filter(queryset, name):
+    """The __date lookups TaskFilter used before its range filters."""
+    now = timezone.now()
+    today = now.date()
+    if name == 'overdue':
+        return queryset.filter(due_date__lt=now, is_done=False)
+    if name == 'due_today':
+        return queryset.filter(due_date__date=today)
+    return queryset.filter(due_date__date__range=[today, today + timedelta(days=7)])
+
+
+def due_filter_page(queryset):
+    """Count and first page of a filtered list, as the list view runs them."""
+    return queryset.count(), list(queryset.values(*TASK_ROW_FIELDS)[:SEARCH_PAGE_SIZE])
+
+
+def due_filter_suite(size, repeat):
+    tasks = Task.objects.select_related('category').order_by('order', '-created_at')
+    results = []
+    for name in ('overdue', 'due_today', 'due_this_week'):
+        current = TaskFilter({name: 'true'}, queryset=tasks).qs
+        matches = current.count()
+        results += [
+            (f'{name} ({matches} matches) __date (before)', measure(lambda: due_filter_page(legacy_due_filter(tasks, name)), repeat)),
+            (f'{name} ({matches} matches) range', measure(lambda: due_filter_page(TaskFilter({name: 'true'}, queryset=tasks).qs), repeat)),
+        ]
+    return results
+
+
+def search_page(backend, query):
+    """Count and first page of a task search, as the list view runs them."""
+    request = Request(APIRequestFactory().get('/api/tasks/', query))
+    queryset = backend.filter_queryset(request, Task.objects.order_by('order', '-created_at'), TaskListCreateView())
+    return queryset.count(), list(queryset.values(*TASK_ROW_FIELDS)[:SEARCH_PAGE_SIZE])
+
+
+def search_suite(size, repeat):
+    results = []
+    for term in SEARCH_TERMS:
+        matches = search_page(TaskSearchFilter(), {'search': term})[0]
+        for name, backend, query in (
+            ('LIKE (before)', filters.SearchFilter(), {'search': term}),
+            ('FTS ranked', TaskSearchFilter(), {'search': term}),
+            ('FTS, ordering=order', TaskSearchFilter(), {'search': term, 'ordering': 'order'}),
+        ):
+            timing = measure(lambda: search_page(backend, query), repeat)
+            results.append((f'{term!r} ({matches} matches) {name}', timing))
+    return results
+
+
+SUITES = {
+    'bulk': bulk_suite,
+    'due_filter': due_filter_suite,
+    'render': render_suite,
+    'response_cache': response_cache_suite,
+    'search': search_suite,
+    'serialize': serialize_suite,
+    'stats': stats_suite,
+}
+
+
+class Command(BaseCommand):
+    help = 'Print p50/p99 latencies of task API code paths at several table sizes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('suite', choices=sorted(SUITES))
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--repeat', type=int, default=50, help='timed runs per case')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        suite = SUITES[options['suite']]
+        rng = random.Random(options['seed'])
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for size in sorted(options['sizes']):
+                started = time.perf_counter()
+                seed_tasks(size, rng)
+                self.stdout.write(f'{size} tasks (seeded in {time.perf_counter() - started:.0f} s)')
+                for name, (p50, p99) in suite(size, options['repeat']):
+                    self.stdout.write(f'  {name:<52} p50 {p50:10.2f} ms   p99 {p99:10.2f} ms')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
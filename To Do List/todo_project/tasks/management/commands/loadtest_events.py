@@ -0,0 +1,133 @@
+"""Load test of the /api/events/ stream on one ASGI worker.
+
+    python manage.py loadtest_events --subscribers 1000 --events 50
+
+Opens the given number of concurrent SSE requests against the project's
+ASGI application on a single event loop (no sockets, so the numbers are
+the worker's own cost), then saves tasks one at a time and reports how
+long each save took to reach every subscriber. Runs against a throwaway
+test database.
+"""
+import asyncio
+import resource
+import statistics
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks.events import get_broker
+from tasks.models import Task
+from todo_project.asgi import application
+
+
+EVENTS_PATH = '/api/events/'
+
+
+class Subscriber:
+    def __init__(self):
+        self.status = None
+        self.events = 0
+        self.received = asyncio.Event()
+        self.disconnect = asyncio.Event()
+        self.body_sent = False
+
+    def scope(self):
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': EVENTS_PATH,
+            'raw_path': EVENTS_PATH.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'accept', b'text/event-stream')],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+
+    async def receive(self):
+        if not self.body_sent:
+            self.body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+        elif message['type'] == 'http.response.body':
+            count = message.get('body', b'').count(b'event: task.saved')
+            if count:
+                self.events += count
+                self.received.set()
+
+
+class Command(BaseCommand):
+    help = 'Measure SSE fan-out latency with many concurrent subscribers on one worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=1000)
+        parser.add_argument('--events', type=int, default=50)
+        parser.add_argument('--timeout', type=float, default=30, help='seconds to wait for each event')
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            asyncio.run(self.run(options['subscribers'], options['events'], options['timeout']))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    async def run(self, subscriber_count, event_count, timeout):
+        broker = get_broker()
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        subscribers = [Subscriber() for _ in range(subscriber_count)]
+        started = time.perf_counter()
+        handlers = [
+            asyncio.create_task(application(subscriber.scope(), subscriber.receive, subscriber.send))
+            for subscriber in subscribers
+        ]
+        while len(broker._subscribers) < subscriber_count:
+            await asyncio.sleep(0.01)
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f'only {len(broker._subscribers)} of {subscriber_count} subscribed')
+        connect_seconds = time.perf_counter() - started
+        rss_connected = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        create_task = sync_to_async(Task.objects.create)
+        latencies = []
+        for number in range(1, event_count + 1):
+            for subscriber in subscribers:
+                subscriber.received.clear()
+            published = time.perf_counter()
+            await create_task(title=f'load test {number}')
+            pending = [subscriber for subscriber in subscribers if subscriber.events < number]
+            while pending:
+                await asyncio.wait_for(
+                    asyncio.gather(*(subscriber.received.wait() for subscriber in pending)), timeout
+                )
+                pending = [subscriber for subscriber in pending if subscriber.events < number]
+            latencies.append((time.perf_counter() - published) * 1000)
+
+        for subscriber in subscribers:
+            subscriber.disconnect.set()
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+        latencies.sort()
+        statuses = {subscriber.status for subscriber in subscribers}
+        self.stdout.write(f'{subscriber_count} subscribers connected in {connect_seconds:.2f} s (statuses {statuses})')
+        self.stdout.write(
+            f'peak RSS grew by {(rss_connected - rss_before) / 1024:.1f} MiB '
+            f'({(rss_connected - rss_before) / subscriber_count:.1f} KiB per subscriber)'
+        )
+        self.stdout.write(
+            f'{event_count} saves delivered to every subscriber: '
+            f'p50 {statistics.median(latencies):.1f} ms, '
+            f'p99 {latencies[min(len(latencies) - 1, round(len(latencies) * 0.99))]:.1f} ms, '
+            f'max {latencies[-1]:.1f} ms'
+        )
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compress responses of at least TASKS_COMPRESSION['MIN_LENGTH'] bytes.
+
+    Uses Brotli for clients that accept it when the ``brotli`` package is
+    installed, gzip otherwise. Streaming responses, including the
+    /api/events/ stream, are passed through untouched so every event is
+    still flushed to the client as it happens.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        config = getattr(settings, 'TASKS_COMPRESSION', {})
+        self.min_length = config.get('MIN_LENGTH', 1024)
+        self.brotli_quality = config.get('BROTLI_QUALITY', 5)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < self.min_length:
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or not re_accepts_brotli.search(accept_encoding):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(response.content, quality=self.brotli_quality)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+        # Same as GZipMiddleware: the body is no longer byte-for-byte what a
+        # strong ETag promised.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:01
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_remove_task_tasks_task_user_id_0c526b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='title',
+            field=models.CharField(max_length=200, validators=[django.core.validators.MaxLengthValidator(200)]),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['order', '-created_at', '-id'], name='tasks_task_order_11b194_idx'),
+        ),
+    ]
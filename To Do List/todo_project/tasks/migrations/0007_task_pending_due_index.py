@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_changes_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_done', False)), fields=['due_date'], name='tasks_task_pending_due_idx'),
+        ),
+    ]
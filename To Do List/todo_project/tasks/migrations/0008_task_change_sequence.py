@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:04
+
+from django.db import migrations, models
+
+
+def create_counter(apps, schema_editor):
+    # Existing tasks and tombstones keep change_seq 0.
+    apps.get_model('tasks', 'ChangeCounter').objects.create(pk=1, value=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_pending_due_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_counter, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_updated_da7eaf_idx',
+        ),
+        # A plain ADD COLUMN on every backend: Django's SQLite AddField
+        # rebuilds the table for a column with a default, which would copy
+        # every task and drop the full-text triggers from 0004.
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE tasks_task ADD COLUMN change_seq bigint NOT NULL DEFAULT 0',
+                    'ALTER TABLE tasks_task DROP COLUMN change_seq',
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE tasks_tasktombstone ADD COLUMN change_seq bigint NOT NULL DEFAULT 0',
+                    'ALTER TABLE tasks_tasktombstone DROP COLUMN change_seq',
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='task',
+                    name='change_seq',
+                    field=models.BigIntegerField(default=0, editable=False),
+                ),
+                migrations.AddField(
+                    model_name='tasktombstone',
+                    name='change_seq',
+                    field=models.BigIntegerField(default=0),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['change_seq', 'id'], name='tasks_task_change__27dd29_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['change_seq', 'id'], name='tasks_taskt_change__ba2d5c_idx'),
+        ),
+    ]
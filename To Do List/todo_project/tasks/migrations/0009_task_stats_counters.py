@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:23
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_tasks(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskStatsCounter = apps.get_model('tasks', 'TaskStatsCounter')
+    groups = Task.objects.order_by().values('category_id', 'priority').annotate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_done=True)),
+        pending_without_due_date=Count('id', filter=Q(is_done=False, due_date__isnull=True)),
+    )
+    TaskStatsCounter.objects.bulk_create([
+        TaskStatsCounter(
+            category_key=group['category_id'] or 0,
+            priority=group['priority'],
+            total=group['total'],
+            completed=group['completed'],
+            pending_without_due_date=group['pending_without_due_date'],
+        )
+        for group in groups
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_change_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatsCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_key', models.BigIntegerField()),
+                ('priority', models.CharField(max_length=10)),
+                ('total', models.BigIntegerField(default=0)),
+                ('completed', models.BigIntegerField(default=0)),
+                ('pending_without_due_date', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['completed_at'], name='tasks_task_completed_at_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskstatscounter',
+            constraint=models.UniqueConstraint(fields=('category_key', 'priority'), name='tasks_stats_counter_group'),
+        ),
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,28 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
 from django.utils import timezone
 from django.core.validators import MaxLengthValidator
 
 
+# Task fields that decide which TaskStatsCounter row a task counts in.
+STATS_FIELDS = frozenset({'category', 'category_id', 'priority', 'is_done', 'due_date'})
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_pending_task_count(self):
+        return self.annotate(
+            pending_task_count=models.Count('tasks', filter=models.Q(tasks__is_done=False))
+        )
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     color = models.CharField(max_length=7, default='#3B82F6', help_text="Hex color code")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = CategoryQuerySet.as_manager()
     
     def __str__(self):
         return self.name
@@ -16,6 +32,60 @@ class Category(models.Model):
         ordering = ['name']
 
 
+def stats_state(category_id, priority, is_done, has_due_date):
+    """What one task contributes to TaskStatsCounter, as a hashable key."""
+    return (category_id or 0, priority, bool(is_done), bool(has_due_date))
+
+
+class TaskQuerySet(models.QuerySet):
+    """Task queries that keep TaskStatsCounter in step with bulk writes.
+    
+    bulk_create() and update() change rows without Task.save(), so they
+    apply the counter deltas themselves, in the same transaction.
+    """
+    
+    def stats_states(self):
+        """Counter of stats_state() keys over the tasks in this queryset."""
+        rows = self.order_by().values('category_id', 'priority', 'is_done').annotate(
+            has_due_date=models.ExpressionWrapper(
+                models.Q(due_date__isnull=False), output_field=models.BooleanField()
+            ),
+            tasks=models.Count('id'),
+        ).values_list('category_id', 'priority', 'is_done', 'has_due_date', 'tasks')
+        states = Counter()
+        for category_id, priority, is_done, has_due_date, tasks in rows:
+            states[stats_state(category_id, priority, is_done, has_due_date)] += tasks
+        return states
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            TaskStatsCounter.apply(Counter(), Counter(task.stats_state() for task in objs))
+        return objs
+    
+    def update(self, **kwargs):
+        if STATS_FIELDS.isdisjoint(kwargs):
+            return super().update(**kwargs)
+        values = {name.removesuffix('_id'): value for name, value in kwargs.items() if name in STATS_FIELDS}
+        if any(hasattr(value, 'resolve_expression') for value in values.values()):
+            raise TypeError('update() needs plain values for fields counted in TaskStatsCounter')
+        category = values.get('category')
+        category_id = category.pk if isinstance(category, models.Model) else category
+        with transaction.atomic(using=self.db):
+            before = self.stats_states()
+            updated = super().update(**kwargs)
+            after = Counter()
+            for (old_category, priority, is_done, has_due_date), tasks in before.items():
+                after[stats_state(
+                    category_id if 'category' in values else old_category,
+                    values.get('priority', priority),
+                    values.get('is_done', is_done),
+                    values['due_date'] is not None if 'due_date' in values else has_due_date,
+                )] += tasks
+            TaskStatsCounter.apply(before, after)
+        return updated
+
+
 class Task(models.Model):
     PRIORITY_CHOICES = [
         ('low', 'Low'),
@@ -33,13 +103,42 @@ class Task(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     order = models.PositiveIntegerField(default=0)
+    # Position in the change feed; see ChangeCounter.
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    
+    objects = TaskQuerySet.as_manager()
+    
+    def stats_state(self):
+        return stats_state(self.category_id, self.priority, self.is_done, self.due_date is not None)
     
     def save(self, *args, **kwargs):
         if self.is_done and not self.completed_at:
             self.completed_at = timezone.now()
         elif not self.is_done:
             self.completed_at = None
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        counted = update_fields is None or not STATS_FIELDS.isdisjoint(update_fields)
+        if update_fields is not None:
+            kwargs['update_fields'] = [*update_fields, 'change_seq']
+        with transaction.atomic():
+            # Taken first: the counter's row lock keeps other writers out
+            # until commit, so the row read below cannot go stale.
+            self.change_seq = ChangeCounter.next_value()
+            # The delta comes from the stored row, never from this
+            # instance's own (possibly stale) copy of it.
+            before = Task.objects.filter(pk=self.pk).stats_states() if counted and self.pk else Counter()
+            super().save(*args, **kwargs)
+            if counted:
+                after = self.stats_state()
+                if update_fields is not None and before:
+                    # Fields left out of update_fields keep their stored values.
+                    written = {name.removesuffix('_id') for name in update_fields}
+                    (stored,) = before
+                    after = tuple(
+                        new if name in written else old
+                        for name, old, new in zip(('category', 'priority', 'is_done', 'due_date'), stored, after)
+                    )
+                TaskStatsCounter.apply(before, Counter([after]))
     
     @property
     def is_overdue(self):
@@ -63,4 +162,106 @@ class Task(models.Model):
             models.Index(fields=['is_done']),
             models.Index(fields=['category']),
             models.Index(fields=['due_date']),
+            # Pending tasks by due date, for the overdue filter and the
+            # due-date statistics; finished tasks never need it.
+            models.Index(fields=['due_date'], condition=models.Q(is_done=False), name='tasks_task_pending_due_idx'),
+            models.Index(fields=['order', '-created_at', '-id']),
+            models.Index(fields=['change_seq', 'id']),
+            # Tasks completed today or this week, for the statistics.
+            models.Index(fields=['completed_at'], condition=models.Q(completed_at__isnull=False), name='tasks_task_completed_at_idx'),
+        ]
+
+
+class TaskTombstone(models.Model):
+    """Deletion log entry read by the task change feed."""
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    change_seq = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"Task {self.task_id} deleted"
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['change_seq', 'id']),
         ]
+
+
+class ChangeCounter(models.Model):
+    """Single-row counter that numbers task changes for the change feed.
+    
+    Every write takes the next number inside its own transaction. The
+    UPDATE keeps the row locked until that transaction ends, so numbers
+    become visible in commit order: once a reader sees the counter at N,
+    every change numbered N or lower has been committed or rolled back.
+    """
+    value = models.BigIntegerField(default=0)
+    
+    @classmethod
+    def next_value(cls):
+        """Take the next number; call inside the transaction that writes."""
+        if not cls.objects.filter(pk=1).update(value=models.F('value') + 1):
+            cls.objects.create(pk=1, value=1)
+        return cls.current_value()
+    
+    @classmethod
+    def current_value(cls):
+        return cls.objects.filter(pk=1).values_list('value', flat=True).first() or 0
+
+
+class TaskStatsCounter(models.Model):
+    """Running task counts for one (category, priority) pair.
+    
+    Every write that changes a task's category, priority, completion or
+    whether it has a due date adjusts these rows with F() deltas in its
+    own transaction (Task.save, TaskQuerySet and the bulk and signal
+    paths), so the statistics never need to count the task table. The
+    buckets that move with the clock are counted separately; see stats.
+    Writers hold the ChangeCounter row lock while they apply deltas, so
+    two of them never race to create the same group.
+    """
+    # Category id, or 0 for tasks without a category.
+    category_key = models.BigIntegerField()
+    priority = models.CharField(max_length=10)
+    total = models.BigIntegerField(default=0)
+    completed = models.BigIntegerField(default=0)
+    pending_without_due_date = models.BigIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['category_key', 'priority'], name='tasks_stats_counter_group'),
+        ]
+    
+    @classmethod
+    def apply(cls, before, after):
+        """Move the counts of stats_state() keys from ``before`` to ``after``."""
+        deltas = {}
+        for states, sign in ((before, -1), (after, 1)):
+            for (category_key, priority, is_done, has_due_date), tasks in states.items():
+                delta = deltas.setdefault((category_key, priority), Counter())
+                delta['total'] += sign * tasks
+                delta['completed'] += sign * tasks * is_done
+                delta['pending_without_due_date'] += sign * tasks * (not is_done and not has_due_date)
+        for (category_key, priority), delta in deltas.items():
+            delta = {name: change for name, change in delta.items() if change}
+            if not delta:
+                continue
+            group = cls.objects.filter(category_key=category_key, priority=priority)
+            if not group.update(**{name: models.F(name) + change for name, change in delta.items()}):
+                cls.objects.create(category_key=category_key, priority=priority, **delta)
+    
+    @classmethod
+    def move_category(cls, category_id):
+        """Count the tasks of a category being deleted as uncategorized."""
+        groups = cls.objects.filter(category_key=category_id)
+        for group in groups:
+            def states(category_key):
+                return Counter({
+                    (category_key, group.priority, True, True): group.completed,
+                    (category_key, group.priority, False, False): group.pending_without_due_date,
+                    (category_key, group.priority, False, True):
+                        group.total - group.completed - group.pending_without_due_date,
+                })
+            cls.apply(states(category_id), states(0))
+        groups.delete()
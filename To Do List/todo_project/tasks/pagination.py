@@ -0,0 +1,83 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TaskPagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset (cursor) mode.
+
+    ``?pagination=cursor`` returns the first keyset page and every ``next``
+    link carries an opaque ``cursor`` parameter. Keyset pages always follow
+    the default ``(order, -created_at, -id)`` ordering, so their cost does
+    not grow with depth and no ``COUNT(*)`` is issued.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    keyset_ordering = ('order', '-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.use_keyset = (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.keyset_ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            order, created_at, pk = position
+            queryset = queryset.filter(
+                Q(order__gte=order),
+                Q(order__gt=order)
+                | Q(created_at__lt=created_at)
+                | Q(created_at=created_at, id__lt=pk),
+            )
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            order, created_at, pk = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            return int(order), datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, task):
+        # Pages hold tasks or, for the values() list path, row dicts.
+        if isinstance(task, dict):
+            order, created_at, pk = task['order'], task['created_at'], task['id']
+        else:
+            order, created_at, pk = task.order, task.created_at, task.pk
+        position = f'{order}|{created_at.isoformat()}|{pk}'
+        return urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.use_keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
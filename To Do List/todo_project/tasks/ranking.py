@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .bulk import BULK_CHUNK_SIZE
+from .events import publish_event
+from .models import ChangeCounter, Task
+
+
+# Distance between neighbouring tasks after a rebalance. Each move halves the
+# gap it lands in, so roughly log2(ORDER_GAP) moves into the same spot fit
+# before the next rebalance.
+ORDER_GAP = 1024
+# Largest value every database backend accepts for a PositiveIntegerField.
+MAX_ORDER = 2147483647
+
+# Same as Task.Meta.ordering with the primary key as the final tie-breaker.
+LIST_ORDERING = ('order', '-created_at', '-id')
+
+
+def rebalance_task_order():
+    """Renumber every task ORDER_GAP apart without changing the list order."""
+    now = timezone.now()
+    change_seq = ChangeCounter.next_value()
+    ids = Task.objects.order_by(*LIST_ORDERING).values_list('id', flat=True)
+    tasks = [
+        Task(id=task_id, order=position * ORDER_GAP, updated_at=now, change_seq=change_seq)
+        for position, task_id in enumerate(ids, 1)
+    ]
+    Task.objects.bulk_update(tasks, ['order', 'updated_at', 'change_seq'], batch_size=BULK_CHUNK_SIZE)
+    publish_event('tasks.bulk_saved', lambda: {'ids': [task.id for task in tasks]})
+
+
+def _free_rank(after_order, before_order):
+    lower = -1 if after_order is None else after_order
+    if before_order is None:
+        rank = lower + ORDER_GAP
+        return rank if rank <= MAX_ORDER else None
+    if before_order - lower < 2:
+        return None
+    return (lower + before_order) // 2
+
+
+def _position(task_id):
+    if task_id is None:
+        return None
+    return Task.objects.select_for_update().values_list('order', 'created_at', 'id').get(id=task_id)
+
+
+def _neighbour_order(task, position, following):
+    """Rank of the task just after (or before) position, skipping task itself.
+
+    Compares on the whole LIST_ORDERING key, like keyset pagination, so a
+    neighbour sharing position's rank is found too (and leaves no free rank).
+    """
+    order, created_at, task_id = position
+    if following:
+        tasks = Task.objects.filter(
+            Q(order__gte=order),
+            Q(order__gt=order) | Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=task_id),
+        ).order_by(*LIST_ORDERING)
+    else:
+        tasks = Task.objects.filter(
+            Q(order__lte=order),
+            Q(order__lt=order) | Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=task_id),
+        ).order_by('-order', 'created_at', 'id')
+    return tasks.exclude(id=task.id).select_for_update().values_list('order', flat=True).first()
+
+
+def move_task(task, after_id=None, before_id=None):
+    """Place task between the tasks after_id and before_id with a single write.
+
+    When only one neighbour is given the other is the task currently next
+    to it, so the task lands directly after after_id (or before before_id),
+    at the top or bottom of the list if that neighbour is first or last.
+    All ranks are spread out again first only when there is no free rank
+    left between the two neighbours.
+    """
+    with transaction.atomic():
+        for attempt in range(2):
+            after, before = _position(after_id), _position(before_id)
+            if after is not None and before is not None and after[0] > before[0]:
+                raise ValueError('"after" must come before "before" in the list.')
+            after_order = after[0] if after is not None else None
+            before_order = before[0] if before is not None else None
+            if before is None:
+                before_order = _neighbour_order(task, after, following=True)
+            elif after is None:
+                after_order = _neighbour_order(task, before, following=False)
+            rank = _free_rank(after_order, before_order)
+            if rank is not None:
+                break
+            rebalance_task_order()
+        else:
+            raise ValueError('"after" must come before "before" in the list.')
+
+        task.order = rank
+        task.save(update_fields=['order', 'updated_at'])
+    return task
@@ -0,0 +1,61 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# An "e" right after a digit: where a number in exponent notation would
+# be, which orjson formats differently from the stdlib (1e16 vs 1e+16,
+# 2.5e-7 vs 2.5e-07). Led by the literal so the scan stays fast.
+EXPONENT_CANDIDATE_RE = re.compile(rb'e(?<=\de)')
+
+
+def has_exponent_number(content):
+    """Whether orjson output ``content`` holds a number in exponent notation.
+
+    Candidates inside strings (e.g. a colour like "#3e8e41") are told apart
+    by what precedes them; the rare string that still looks like a number
+    only costs a fallback to the stdlib encoder.
+    """
+    for match in EXPONENT_CANDIDATE_RE.finditer(content):
+        start = match.start()
+        while start and content[start - 1] in b'0123456789.-':
+            start -= 1
+        if start and content[start - 1] in b'[:,':
+            return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed.
+
+    Produces the same compact UTF-8 output as JSONRenderer. Indented
+    or ASCII-only output, data orjson cannot encode (e.g. integers beyond
+    64 bits) and floats it would write in exponent notation go through
+    the stdlib encoder as before. NaN and infinities, which JSONRenderer
+    refuses, come out as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            # Datetimes and other non-JSON types go to DRF's encoder so they
+            # come out exactly as JSONRenderer writes them.
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if has_exponent_number(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep JSONRenderer's escaping of the two JavaScript line terminators.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.crypto import md5
+from django.utils.dateparse import parse_datetime
+from rest_framework.response import Response
+
+
+HITS_KEY = 'tasks:responses:hits'
+MISSES_KEY = 'tasks:responses:misses'
+
+
+def _config():
+    config = getattr(settings, 'TASKS_RESPONSE_CACHE', {})
+    return caches[config.get('ALIAS', 'default')], config.get('TIMEOUT', 60)
+
+
+def _incr(cache, key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, None):
+            return 1
+        return cache.incr(key)
+
+
+def response_cache_metrics():
+    cache, _ = _config()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups * 100, 1) if lookups else 0.0,
+    }
+
+
+def response_cache_key(request, etag):
+    """Key of a response body, derived from the ETag it is served with.
+
+    The ETag already names the version of everything the body depends
+    on (see the views' get_etag()), so a write moves every process on to
+    new keys at once and no entry ever needs to be deleted.
+    """
+    digest = md5(repr((request.path, etag)).encode(), usedforsecurity=False).hexdigest()
+    return f'tasks:responses:{digest}'
+
+
+def refresh_time_fields(task, now):
+    """Recompute the clock-dependent fields of a serialized task, as Task does."""
+    due_date = parse_datetime(task['due_date']) if task['due_date'] else None
+    pending = due_date is not None and not task['is_done']
+    task['is_overdue'] = pending and now > due_date
+    task['days_until_due'] = (due_date - now).days if pending else None
+
+
+class CachedResponseMixin:
+    """Serve list() and retrieve() from the task response cache.
+
+    Entries hold serialized data keyed by the ETag that ConditionalGetMixin
+    computed for the request, so a cached body is only ever served with
+    the validator it was built under, whichever process stored it.
+    is_overdue and days_until_due are recomputed on every hit. Must come
+    after ConditionalGetMixin in the bases.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+    def cached_response(self, request, build, *args, **kwargs):
+        cache, timeout = _config()
+        now = timezone.now()
+        key = response_cache_key(request, self.etag)
+        data = cache.get(key)
+        if data is None:
+            _incr(cache, MISSES_KEY)
+            response = build(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            response['X-Cache'] = 'MISS'
+            return response
+
+        _incr(cache, HITS_KEY)
+        # Paginated list pages carry their tasks under 'results'.
+        for task in data['results'] if 'results' in data else [data]:
+            refresh_time_fields(task, now)
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
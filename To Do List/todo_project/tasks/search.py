@@ -0,0 +1,68 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Must match the expression indexed by migration 0004.
+POSTGRESQL_VECTOR = (
+    "to_tsvector('simple', coalesce({table}.title, '') || ' ' || coalesce({table}.description, ''))"
+)
+
+
+class TaskSearchFilter(filters.SearchFilter):
+    """Full-text search over task titles and descriptions.
+
+    Uses the FTS5 table on SQLite and the GIN expression index on PostgreSQL,
+    both created by migration 0004; other databases fall back to the
+    ``LIKE`` lookups of ``SearchFilter``. Every word is prefix-matched and
+    results are ranked by relevance unless the client passes an explicit
+    ordering, so this backend must run after ``OrderingFilter``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        words = [
+            word
+            for term in self.get_search_terms(request)
+            for word in TOKEN_RE.findall(term)
+        ]
+        vendor = connections[queryset.db].vendor
+        if not words or vendor not in ('sqlite', 'postgresql'):
+            return super().filter_queryset(request, queryset, view)
+
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        ordered = api_settings.ORDERING_PARAM in request.query_params
+        if vendor == 'sqlite':
+            match = ' '.join(f'"{word}"*' for word in words)
+            fts_name = queryset.model._meta.db_table + '_fts'
+            fts_table = connections[queryset.db].ops.quote_name(fts_name)
+            # Joined once: MATCH drives the lookup and bm25() is read off the
+            # same FTS row, rather than matching again for every task.
+            queryset = queryset.extra(
+                tables=[fts_name],
+                where=[f'{fts_table}.rowid = {table}.id', f'{fts_table} MATCH %s'],
+                params=[match],
+            )
+            if ordered:
+                return queryset
+            # bm25() is lower for better matches.
+            return queryset.extra(select={'search_rank': f'bm25({fts_table})'}).order_by(
+                'search_rank', *queryset.query.order_by
+            )
+
+        tsquery = ' & '.join(f'{word}:*' for word in words)
+        vector = POSTGRESQL_VECTOR.format(table=table)
+        queryset = queryset.filter(RawSQL(
+            f"{vector} @@ to_tsquery('simple', %s)", (tsquery,), output_field=BooleanField()
+        ))
+        if ordered:
+            return queryset
+        rank = RawSQL(
+            f"ts_rank({vector}, to_tsquery('simple', %s))", (tsquery,), output_field=FloatField()
+        )
+        return queryset.annotate(search_rank=rank).order_by('-search_rank', *queryset.query.order_by)
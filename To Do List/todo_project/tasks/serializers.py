@@ -1,5 +1,7 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Task, Category
+from . import bulk
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -11,10 +13,42 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_task_count(self, obj):
-        return obj.tasks.filter(is_done=False).count()
+        # Views annotate pending_task_count; fall back to a query for
+        # instances that were not loaded through them (e.g. after create).
+        pending = getattr(obj, 'pending_task_count', None)
+        if pending is None:
+            pending = obj.tasks.filter(is_done=False).count()
+        return pending
+
+
+class CategoryField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that resolves from ``context['categories']`` when given.
+
+    Bulk callers preload the categories once instead of running one lookup
+    per submitted task.
+    """
+    
+    def to_internal_value(self, data):
+        categories = self.context.get('categories')
+        if categories is None:
+            return super().to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            return categories[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class TaskBulkListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        return bulk.bulk_create_tasks(validated_data)
 
 
 class TaskSerializer(serializers.ModelSerializer):
+    category = CategoryField(queryset=Category.objects.all(), allow_null=True, required=False)
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_color = serializers.CharField(source='category.color', read_only=True)
     is_overdue = serializers.ReadOnlyField()
@@ -29,6 +63,66 @@ class TaskSerializer(serializers.ModelSerializer):
             'days_until_due', 'order'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'completed_at']
+        list_serializer_class = TaskBulkListSerializer
+
+
+# Columns read by serialize_task_rows(), in TaskSerializer field order.
+TASK_ROW_FIELDS = (
+    'id', 'title', 'description', 'is_done', 'priority', 'due_date',
+    'category_id', 'category__name', 'category__color',
+    'created_at', 'updated_at', 'completed_at', 'order',
+)
+
+
+def serialize_task_rows(rows, now=None):
+    """Return TaskSerializer(many=True).data for ``values(*TASK_ROW_FIELDS)`` rows.
+    
+    Read-only fast path for list pages: builds the output dicts directly
+    instead of going through a field object per value, and evaluates
+    is_overdue and days_until_due against a single ``now``.
+    """
+    now = now or timezone.now()
+    datetime_field = serializers.DateTimeField()
+    # Look the active time zone up once instead of for every value.
+    datetime_field.timezone = datetime_field.default_timezone()
+    to_datetime = datetime_field.to_representation
+    data = []
+    for row in rows:
+        due_date = row['due_date']
+        pending = due_date is not None and not row['is_done']
+        task = {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'is_done': row['is_done'],
+            'priority': row['priority'],
+            'due_date': to_datetime(due_date),
+            'category': row['category_id'],
+        }
+        # Like the source='category.*' fields, omitted for tasks without one.
+        if row['category_id'] is not None:
+            task['category_name'] = row['category__name']
+            task['category_color'] = row['category__color']
+        task['created_at'] = to_datetime(row['created_at'])
+        task['updated_at'] = to_datetime(row['updated_at'])
+        task['completed_at'] = to_datetime(row['completed_at'])
+        task['is_overdue'] = pending and now > due_date
+        task['days_until_due'] = (due_date - now).days if pending else None
+        task['order'] = row['order']
+        data.append(task)
+    return data
+
+
+class PriorityStatsSerializer(serializers.Serializer):
+    priority = serializers.CharField()
+    total = serializers.IntegerField()
+    completed = serializers.IntegerField()
+
+
+class CategoryStatsSerializer(serializers.Serializer):
+    category = serializers.IntegerField(allow_null=True)
+    total = serializers.IntegerField()
+    completed = serializers.IntegerField()
 
 
 class TaskStatsSerializer(serializers.Serializer):
@@ -39,3 +133,41 @@ class TaskStatsSerializer(serializers.Serializer):
     completion_rate = serializers.FloatField()
     today_completed = serializers.IntegerField()
     this_week_completed = serializers.IntegerField()
+    due_today = serializers.IntegerField()
+    due_soon = serializers.IntegerField()
+    due_later = serializers.IntegerField()
+    no_due_date = serializers.IntegerField()
+    by_priority = PriorityStatsSerializer(many=True)
+    by_category = CategoryStatsSerializer(many=True)
+
+
+class TaskBulkDeleteSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=bulk.BULK_MAX_TASKS
+    )
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    update_data = serializers.DictField()
+    
+    def validate_update_data(self, value):
+        serializer = TaskSerializer(data=value, partial=True)
+        serializer.is_valid(raise_exception=True)
+        if not serializer.validated_data:
+            raise serializers.ValidationError('No updatable fields given.')
+        return serializer.validated_data
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    after = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), allow_null=True, required=False)
+    before = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), allow_null=True, required=False)
+    
+    def validate(self, attrs):
+        after, before = attrs.get('after'), attrs.get('before')
+        if after is None and before is None:
+            raise serializers.ValidationError('Either "after" or "before" is required.')
+        task = self.context['task']
+        if task in (after, before):
+            raise serializers.ValidationError('A task cannot be moved next to itself.')
+        return attrs
@@ -0,0 +1,90 @@
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .events import publish_event
+from .models import Category, ChangeCounter, Task, TaskStatsCounter, TaskTombstone
+
+
+_local = threading.local()
+
+
+@contextmanager
+def bulk_task_changes():
+    """Skip the per-row Task handlers below inside the block.
+
+    For bulk paths that go through save()/delete() signals but adjust
+    TaskStatsCounter, publish events and write the deletion log in batches
+    themselves.
+    """
+    previous = getattr(_local, 'bulk', False)
+    _local.bulk = True
+    try:
+        yield
+    finally:
+        _local.bulk = previous
+
+
+def in_bulk_change():
+    return getattr(_local, 'bulk', False)
+
+
+@receiver(pre_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    if in_bulk_change():
+        return
+    # Taken before the row goes, like Task.save(): the counter's row lock
+    # orders this delete against other writers. record_tombstone reuses it.
+    instance._deleted_change_seq = ChangeCounter.next_value()
+    TaskStatsCounter.apply(Task.objects.filter(pk=instance.pk).stats_states(), Counter())
+
+
+@receiver(post_delete, sender=Task)
+def record_tombstone(sender, instance, **kwargs):
+    if in_bulk_change():
+        return
+    # Runs inside the delete's transaction, like the counter update.
+    TaskTombstone.objects.create(task_id=instance.pk, change_seq=instance._deleted_change_seq)
+
+
+@receiver(pre_delete, sender=Category)
+def touch_category_tasks(sender, instance, **kwargs):
+    # Deleting a category nulls Task.category with a plain UPDATE; bump
+    # updated_at and change_seq so validators and the change feed notice,
+    # and count its tasks as uncategorized.
+    Task.objects.filter(category=instance).update(
+        updated_at=timezone.now(), change_seq=ChangeCounter.next_value()
+    )
+    TaskStatsCounter.move_category(instance.pk)
+
+
+def _serialize(serializer_name, instance):
+    # Imported lazily: the serializers module depends on this one.
+    from . import serializers
+    return getattr(serializers, serializer_name)(instance).data
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, **kwargs):
+    if not in_bulk_change():
+        publish_event('task.saved', lambda: _serialize('TaskSerializer', instance))
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    if not in_bulk_change():
+        publish_event('task.deleted', lambda: {'id': instance.pk})
+
+
+@receiver(post_save, sender=Category)
+def publish_category_saved(sender, instance, **kwargs):
+    publish_event('category.saved', lambda: _serialize('CategorySerializer', instance))
+
+
+@receiver(post_delete, sender=Category)
+def publish_category_deleted(sender, instance, **kwargs):
+    publish_event('category.deleted', lambda: {'id': instance.pk})
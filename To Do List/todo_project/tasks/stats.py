@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import ChangeCounter, Task, TaskStatsCounter
+
+
+STATS_CACHE_KEY = 'tasks:stats'
+# Upper bound on how long a cached snapshot may live. Snapshots are keyed
+# by the change counter, so any write retires them in every process; the
+# timeout only bounds how long a retired one takes up cache memory.
+STATS_CACHE_TIMEOUT = 60
+# Due-date buckets go by local calendar day, as in the command-line
+# scripts' task_stats.py, whose due dates carry no time: a pending task is
+# overdue from the day after it is due, due today all of its due day and
+# due soon on the DUE_SOON_DAYS days after that. Completed tasks are in
+# none of them.
+DUE_SOON_DAYS = 7
+
+COUNTERS = (
+    'total', 'completed', 'overdue', 'today_completed', 'this_week_completed',
+    'due_today', 'due_soon', 'due_later', 'no_due_date',
+)
+
+
+def _period_starts(now):
+    local_now = timezone.localtime(now)
+    today_start = local_now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = today_start - timedelta(days=today_start.weekday())
+    return today_start, week_start
+
+
+def _add_breakdown(breakdown, key, total, completed):
+    counts = breakdown.setdefault(key, {'total': 0, 'completed': 0})
+    counts['total'] += total
+    counts['completed'] += completed
+    if not counts['total']:
+        del breakdown[key]
+
+
+def _compute_entry(now):
+    today_start, week_start = _period_starts(now)
+    tomorrow_start = today_start + timedelta(days=1)
+    soon_end = tomorrow_start + timedelta(days=DUE_SOON_DAYS)
+
+    # Everything that only changes on writes is kept in TaskStatsCounter.
+    counts = dict.fromkeys(COUNTERS, 0)
+    by_priority = {}
+    by_category = {}
+    pending_with_due_date = 0
+    for group in TaskStatsCounter.objects.all():
+        counts['total'] += group.total
+        counts['completed'] += group.completed
+        counts['no_due_date'] += group.pending_without_due_date
+        pending_with_due_date += group.total - group.completed - group.pending_without_due_date
+        _add_breakdown(by_priority, group.priority, group.total, group.completed)
+        _add_breakdown(by_category, group.category_key or None, group.total, group.completed)
+
+    # The buckets that move with the clock are counted from two index
+    # ranges: pending tasks due before soon_end (tasks_task_pending_due_idx)
+    # and tasks completed this week (tasks_task_completed_at_idx).
+    due = Task.objects.filter(is_done=False, due_date__lt=soon_end).aggregate(
+        overdue=Count('id', filter=Q(due_date__lt=today_start)),
+        due_today=Count('id', filter=Q(due_date__gte=today_start, due_date__lt=tomorrow_start)),
+        due_soon=Count('id', filter=Q(due_date__gte=tomorrow_start)),
+    )
+    completed = Task.objects.filter(completed_at__gte=week_start).aggregate(
+        today_completed=Count('id', filter=Q(completed_at__gte=today_start)),
+        this_week_completed=Count('id'),
+    )
+    counts.update(
+        overdue=due['overdue'],
+        due_today=due['due_today'],
+        due_soon=due['due_soon'],
+        due_later=pending_with_due_date - due['overdue'] - due['due_today'] - due['due_soon'],
+        **completed,
+    )
+
+    return {
+        'counts': counts,
+        'by_priority': by_priority,
+        'by_category': by_category,
+        'today_start': today_start,
+        'week_start': week_start,
+        'tomorrow_start': tomorrow_start,
+        'soon_end': soon_end,
+        # The snapshot stays exact until the day rolls over.
+        'valid_until': tomorrow_start,
+    }
+
+
+def _is_fresh(entry, now):
+    return entry is not None and now < entry['valid_until']
+
+
+def get_task_stats():
+    """Return the dashboard statistics, served from cache when possible."""
+    now = timezone.now()
+    # Read the change counter before querying: if a write commits
+    # meanwhile, the snapshot is stored under a number already passed.
+    key = f'{STATS_CACHE_KEY}:{ChangeCounter.current_value()}'
+    entry = cache.get(key)
+    if not _is_fresh(entry, now):
+        entry = _compute_entry(now)
+        # Kept until it stops being exact, never extended.
+        timeout = min(STATS_CACHE_TIMEOUT, (entry['valid_until'] - now).total_seconds())
+        if timeout > 0:
+            cache.set(key, entry, timeout)
+
+    counts = entry['counts']
+    total = counts['total']
+    completed = counts['completed']
+    completion_rate = (completed / total * 100) if total > 0 else 0
+    return {
+        'total': total,
+        'completed': completed,
+        'pending': total - completed,
+        'overdue': counts['overdue'],
+        'completion_rate': round(completion_rate, 1),
+        'today_completed': counts['today_completed'],
+        'this_week_completed': counts['this_week_completed'],
+        'due_today': counts['due_today'],
+        'due_soon': counts['due_soon'],
+        'due_later': counts['due_later'],
+        'no_due_date': counts['no_due_date'],
+        'by_priority': [
+            {'priority': priority, **entry['by_priority'].get(priority, {'total': 0, 'completed': 0})}
+            for priority, _ in Task.PRIORITY_CHOICES
+        ],
+        'by_category': [
+            {'category': category_id, **category_counts}
+            for category_id, category_counts in sorted(
+                entry['by_category'].items(), key=lambda item: (item[0] is not None, item[0] or 0)
+            )
+        ],
+    }
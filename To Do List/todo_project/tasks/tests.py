@@ -0,0 +1,743 @@
+import gzip
+from base64 import urlsafe_b64encode
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+from uuid import UUID
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from . import bulk, views
+from .changes import get_changes
+from .middleware import CompressionMiddleware, brotli
+from .models import Category, ChangeCounter, Task, TaskStatsCounter, TaskTombstone
+from .pagination import TaskPagination
+from .ranking import LIST_ORDERING, ORDER_GAP
+from .renderers import FastJSONRenderer, has_exponent_number, orjson
+from .response_cache import response_cache_metrics
+from .serializers import TASK_ROW_FIELDS, TaskSerializer, serialize_task_rows
+
+
+class TaskAPITestCase(APITestCase):
+    def setUp(self):
+        # The statistics and response caches outlive a test's transaction.
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+
+class CategoryQueryCountTests(TaskAPITestCase):
+    def create_categories(self, count):
+        categories = Category.objects.bulk_create(
+            Category(name=f'Category {number}') for number in range(count)
+        )
+        tasks = []
+        for category in categories:
+            tasks += [
+                Task(title='pending', category=category),
+                Task(title='pending', category=category),
+                Task(title='done', category=category, is_done=True),
+            ]
+        Task.objects.bulk_create(tasks)
+        return categories
+
+    def assert_list_queries(self, category_count):
+        self.create_categories(category_count)
+        # Unpaginated, so every category is serialized.
+        with mock.patch.object(views.CategoryListCreateView, 'pagination_class', None):
+            # Two for the ETag, one for the annotated list.
+            with self.assertNumQueries(3):
+                response = self.client.get('/api/categories/')
+        self.assertEqual(len(response.data), category_count)
+        self.assertEqual({category['task_count'] for category in response.data}, {2})
+
+    def test_list_with_one_category(self):
+        self.assert_list_queries(1)
+
+    def test_list_with_500_categories(self):
+        self.assert_list_queries(500)
+
+    def test_paginated_list(self):
+        self.create_categories(500)
+        # ETag, COUNT(*) for the page count, and the page itself.
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/categories/')
+        self.assertEqual(response.data['count'], 500)
+
+    def test_detail(self):
+        category = self.create_categories(1)[0]
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/categories/{category.id}/')
+        self.assertEqual(response.data['task_count'], 2)
+
+
+class KeysetPaginationTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Task.objects.bulk_create(Task(title=f'task {number}', order=number % 5) for number in range(45))
+        # Ties on (order, created_at) leave the id to break them.
+        Task.objects.update(created_at=datetime(2025, 1, 1, tzinfo=dt_timezone.utc))
+
+    def walk(self, url):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            titles += [task['title'] for task in response.data['results']]
+            url = response.data['next']
+        return titles
+
+    def test_cursor_pages_cover_every_task_once_in_list_order(self):
+        expected = list(Task.objects.order_by('order', '-created_at', '-id').values_list('title', flat=True))
+        self.assertEqual(self.walk('/api/tasks/?pagination=cursor'), expected)
+
+    def test_cursor_round_trips(self):
+        paginator = TaskPagination()
+        task = Task.objects.order_by('id').first()
+        request = mock.Mock(query_params={'cursor': paginator.encode_cursor(task)})
+        self.assertEqual(paginator.decode_cursor(request), (task.order, task.created_at, task.pk))
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ('!!!', urlsafe_b64encode(b'1|2').decode(), urlsafe_b64encode(b'a|b|c').decode(), '4pyT'):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/tasks/', {'cursor': cursor}).status_code, 404)
+
+    def test_cursor_pages_do_not_count(self):
+        second_page = self.client.get('/api/tasks/?pagination=cursor').data['next']
+        cache.clear()
+        # Category version, change counter and the page itself.
+        with self.assertNumQueries(3), CaptureQueriesContext(connection) as queries:
+            self.client.get(second_page)
+        self.assertFalse([
+            query['sql'] for query in queries if 'COUNT(' in query['sql'] and 'FROM "tasks_task"' in query['sql']
+        ])
+
+
+class TaskStatsTests(TaskAPITestCase):
+    def get_stats(self):
+        return self.client.get('/api/tasks/stats/').data
+
+    def test_repeated_request_is_served_from_cache(self):
+        Task.objects.create(title='task')
+        self.get_stats()
+        # The change counter, read once for the ETag and once for the body.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get_stats()['total'], 1)
+
+    def test_stale_instances_do_not_double_count(self):
+        task = Task.objects.create(title='task')
+        first = Task.objects.get(pk=task.pk)
+        second = Task.objects.get(pk=task.pk)
+        self.get_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            first.is_done = True
+            first.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            second.is_done = True
+            second.save()
+        stats = self.get_stats()
+        self.assertEqual((stats['completed'], stats['pending']), (1, 0))
+
+    def test_writes_retire_the_snapshot(self):
+        tasks = Task.objects.bulk_create(Task(title=f'task {number}') for number in range(3))
+        self.assertEqual(self.get_stats()['total'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/tasks/{tasks[0].id}/')
+        self.assertEqual(self.get_stats()['total'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/tasks/bulk/', {
+                'task_ids': [tasks[1].id, tasks[2].id], 'update_data': {'is_done': True},
+            }, format='json')
+        stats = self.get_stats()
+        self.assertEqual((stats['total'], stats['completed']), (2, 2))
+
+    def test_counters_match_a_recount(self):
+        work, home = Category.objects.create(name='Work'), Category.objects.create(name='Home')
+        due = datetime.now(dt_timezone.utc) + timedelta(days=3)
+        tasks = Task.objects.bulk_create([
+            Task(title='a', category=work, priority='high', due_date=due),
+            Task(title='b', category=work, is_done=True),
+            Task(title='c', category=home),
+            Task(title='d'),
+        ])
+        stale = Task.objects.get(pk=tasks[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/tasks/{tasks[0].id}/', {'is_done': True, 'due_date': None}, format='json')
+            stale.priority = 'low'
+            stale.save(update_fields=['priority'])
+            self.client.patch('/api/tasks/bulk/', {
+                'task_ids': [tasks[2].id, tasks[3].id], 'update_data': {'category': work.id, 'priority': 'low'},
+            }, format='json')
+            self.client.delete(f'/api/tasks/{tasks[1].id}/')
+            self.client.post('/api/tasks/bulk/', [{'title': 'e', 'category': home.id, 'due_date': due}], format='json')
+            self.client.delete('/api/tasks/bulk/', {'task_ids': [tasks[2].id]}, format='json')
+            work.delete()
+        counters = {
+            (group.category_key, group.priority): (group.total, group.completed, group.pending_without_due_date)
+            for group in TaskStatsCounter.objects.all() if group.total
+        }
+        recount = {}
+        for task in Task.objects.all():
+            total, completed, pending_without_due_date = recount.get((task.category_id or 0, task.priority), (0, 0, 0))
+            recount[(task.category_id or 0, task.priority)] = (
+                total + 1, completed + task.is_done, pending_without_due_date + (not task.is_done and not task.due_date),
+            )
+        self.assertEqual(counters, recount)
+        self.assertEqual(self.get_stats()['total'], 3)
+
+    def test_due_buckets_go_by_calendar_day(self):
+        # Same cases as task_stats' DueBucketTests in the scripts' test_task_files.py.
+        today = datetime(2026, 3, 11, tzinfo=dt_timezone.utc)
+        Task.objects.bulk_create([
+            Task(title='earlier today', due_date=today + timedelta(hours=9)),
+            Task(title='later today', due_date=today + timedelta(hours=23)),
+            Task(title='yesterday', due_date=today - timedelta(minutes=1)),
+            Task(title='completed and overdue', due_date=today - timedelta(days=1), is_done=True),
+            Task(title='exactly 7 days out', due_date=today + timedelta(days=7, hours=23)),
+            Task(title='8 days out', due_date=today + timedelta(days=8)),
+            Task(title='no due date'),
+        ])
+        with mock.patch('tasks.stats.timezone.now', return_value=today + timedelta(hours=12)):
+            stats = self.get_stats()
+        self.assertEqual(
+            {bucket: stats[bucket] for bucket in ('completed', 'overdue', 'due_today', 'due_soon', 'due_later', 'no_due_date')},
+            {'completed': 1, 'overdue': 1, 'due_today': 2, 'due_soon': 1, 'due_later': 1, 'no_due_date': 1},
+        )
+
+
+class TaskSearchTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Task.objects.create(title='Write report', description='quarterly numbers', order=1)
+        Task.objects.create(title='Review', description='write write write', order=2)
+        Task.objects.create(title='Groceries', description='milk, eggs', order=3)
+
+    def search(self, query):
+        response = self.client.get('/api/tasks/', query)
+        return [task['title'] for task in response.data['results']]
+
+    def test_prefix_match_ranked_by_relevance(self):
+        self.assertEqual(self.search({'search': 'wri'}), ['Review', 'Write report'])
+
+    def test_explicit_ordering_replaces_the_ranking(self):
+        self.assertEqual(self.search({'search': 'wri', 'ordering': 'order'}), ['Write report', 'Review'])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search({'search': 'write quart'}), ['Write report'])
+
+    def test_full_text_table_is_joined_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.search({'search': 'wri'})
+        statements = [query['sql'] for query in queries if 'tasks_task_fts' in query['sql']]
+        self.assertTrue(statements)
+        for sql in statements:
+            self.assertEqual(sql.count('MATCH'), 1, sql)
+
+
+class BulkUpdateTests(TaskAPITestCase):
+    def test_list_body_is_rejected(self):
+        response = self.client.patch('/api/tasks/bulk/', [{'id': 1}], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_ids_are_required(self):
+        response = self.client.patch('/api/tasks/bulk/', {'update_data': {'is_done': True}}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('task_ids', response.data)
+
+    def test_empty_task_ids_are_rejected(self):
+        response = self.client.patch(
+            '/api/tasks/bulk/', {'task_ids': [], 'update_data': {'is_done': True}}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('task_ids', response.data)
+
+    def test_completing_sets_completed_at(self):
+        task = Task.objects.create(title='task')
+        response = self.client.patch(
+            '/api/tasks/bulk/', {'task_ids': [task.id, 0], 'update_data': {'is_done': True}}, format='json'
+        )
+        self.assertEqual(response.data['results'], [
+            {'id': task.id, 'status': 'updated'}, {'id': 0, 'status': 'not_found'},
+        ])
+        task.refresh_from_db()
+        self.assertIsNotNone(task.completed_at)
+
+
+class BulkCreateDeleteTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = mock.Mock(has_subscribers=True)
+        patcher = mock.patch('tasks.events.get_broker', return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def events(self):
+        return [call.args[0] for call in self.broker.publish.call_args_list]
+
+    def test_create_is_all_or_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/tasks/bulk/', [
+                {'title': 'fine'}, {'title': 'bad', 'priority': 'urgent'},
+            ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(self.events(), [])
+
+    def test_create_publishes_one_event_for_every_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/tasks/bulk/', [
+                {'title': 'a'}, {'title': 'b', 'is_done': True},
+            ], format='json')
+        self.assertEqual(response.status_code, 201)
+        ids = [task['id'] for task in response.data]
+        self.assertEqual(self.events(), [{'type': 'tasks.bulk_saved', 'data': {'ids': ids}}])
+        self.assertIsNotNone(Task.objects.get(id=ids[1]).completed_at)
+
+    def test_size_limit(self):
+        too_many = bulk.BULK_MAX_TASKS + 1
+        for method, data in (
+            (self.client.post, [{'title': 'task'}] * too_many),
+            (self.client.delete, {'task_ids': list(range(1, too_many + 1))}),
+        ):
+            with self.subTest(method=method.__name__):
+                self.assertEqual(method('/api/tasks/bulk/', data, format='json').status_code, 400)
+        self.assertFalse(Task.objects.exists())
+
+    def test_delete_is_all_or_nothing(self):
+        task = Task.objects.create(title='task')
+        response = self.client.delete('/api/tasks/bulk/', {'task_ids': [task.id, 'x']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Task.objects.filter(id=task.id).exists())
+
+    def test_delete_records_one_tombstone_and_event(self):
+        tasks = [Task.objects.create(title=f'task {number}') for number in range(3)]
+        ids = [task.id for task in tasks[:2]]
+        cursor = get_changes(None)['cursor']
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete('/api/tasks/bulk/', {'task_ids': [*ids, 0]}, format='json')
+        self.assertEqual(response.data['results'], [
+            {'id': ids[0], 'status': 'deleted'}, {'id': ids[1], 'status': 'deleted'}, {'id': 0, 'status': 'not_found'},
+        ])
+        self.assertEqual(sorted(TaskTombstone.objects.values_list('task_id', flat=True)), ids)
+        # The per-row delete handlers stay out of the way: one event, no task.deleted.
+        self.assertEqual(self.events(), [{'type': 'tasks.bulk_deleted', 'data': {'ids': ids}}])
+        self.assertEqual(sorted(get_changes(cursor)['deleted']), ids)
+
+
+class TaskMoveTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.tasks = {
+            title: Task.objects.create(title=title, order=order)
+            for title, order in (('t3', 1024), ('t0', 1536), ('t2', 2048), ('t1', 3072))
+        }
+
+    def move(self, title, **neighbours):
+        response = self.client.post(f'/api/tasks/{self.tasks[title].id}/move/', {
+            side: self.tasks[other].id for side, other in neighbours.items()
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def listed(self):
+        return list(Task.objects.order_by(*LIST_ORDERING).values_list('title', flat=True))
+
+    def assertRanksDistinct(self):
+        orders = list(Task.objects.values_list('order', flat=True))
+        self.assertEqual(len(set(orders)), len(orders))
+
+    def test_after_only_lands_before_the_next_task(self):
+        self.move('t1', after='t3')
+        self.assertEqual(self.listed(), ['t3', 't1', 't0', 't2'])
+        self.assertRanksDistinct()
+
+    def test_before_only_lands_after_the_previous_task(self):
+        self.move('t3', before='t1')
+        self.assertEqual(self.listed(), ['t0', 't2', 't3', 't1'])
+        self.assertRanksDistinct()
+
+    def test_between_two_neighbours(self):
+        self.move('t1', after='t0', before='t2')
+        self.assertEqual(self.listed(), ['t3', 't0', 't1', 't2'])
+
+    def test_to_the_head(self):
+        self.move('t2', before='t3')
+        self.assertEqual(self.listed(), ['t2', 't3', 't0', 't1'])
+
+    def test_to_the_tail(self):
+        self.move('t3', after='t1')
+        self.assertEqual(self.listed(), ['t0', 't2', 't1', 't3'])
+
+    def test_used_up_gap_is_rebalanced(self):
+        Task.objects.filter(id=self.tasks['t0'].id).update(order=1025)
+        self.move('t1', after='t3')
+        self.assertEqual(self.listed(), ['t3', 't1', 't0', 't2'])
+        self.assertRanksDistinct()
+        self.assertEqual(Task.objects.get(id=self.tasks['t2'].id).order, 3 * ORDER_GAP)
+
+    def test_tied_ranks_are_separated(self):
+        # Equal ranks list newest first, so t2 now comes before t0.
+        Task.objects.filter(id=self.tasks['t2'].id).update(order=1536)
+        self.move('t1', after='t2')
+        self.assertEqual(self.listed(), ['t3', 't2', 't1', 't0'])
+        self.assertRanksDistinct()
+
+
+class TaskEventsTests(TaskAPITestCase):
+    def test_refused_under_wsgi(self):
+        response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.streaming)
+
+    async def test_streams_under_asgi(self):
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 3000\n\n')
+        await chunks.aclose()
+
+
+class ConditionalGetTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # Keep list ETags from rolling over between two requests.
+        bucket = mock.patch('tasks.views.time_bucket', return_value=0)
+        bucket.start()
+        self.addCleanup(bucket.stop)
+        self.category = Category.objects.create(name='Work')
+        self.task = Task.objects.create(title='Filed', category=self.category)
+        Task.objects.create(title='Loose')
+        self.urls = [
+            '/api/tasks/',
+            f'/api/tasks/{self.task.id}/',
+            '/api/categories/',
+            '/api/tasks/stats/',
+        ]
+
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def etags(self):
+        return {url: self.etag(url) for url in self.urls}
+
+    def test_repeated_get_is_not_modified(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=self.etag(url))
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    def test_not_modified_queries(self):
+        # Only what the ETag needs: the change counter and category version
+        # (or the one row) and, for stats, the counter the snapshot is cached under.
+        for url, queries in zip(self.urls, (2, 1, 2, 1)):
+            etag = self.etag(url)
+            with self.subTest(url=url), self.assertNumQueries(queries):
+                self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_validators_do_not_read_the_task_table(self):
+        for url in ('/api/tasks/', '/api/tasks/?pagination=cursor&overdue=true', '/api/categories/'):
+            etag = self.etag(url)
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertFalse([query['sql'] for query in queries if '"tasks_task"' in query['sql']])
+
+    def assert_changed(self, urls, change):
+        before = self.etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = change()
+        self.assertLess(response.status_code, 300)
+        after = self.etags()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNotEqual(before[url], after[url])
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=before[url]).status_code, 200)
+
+    def test_task_write_changes_etags(self):
+        self.assert_changed(self.urls, lambda: self.client.patch(
+            f'/api/tasks/{self.task.id}/', {'is_done': True}, format='json'
+        ))
+
+    def test_category_rename_changes_etags(self):
+        self.assert_changed(self.urls[:3], lambda: self.client.patch(
+            f'/api/categories/{self.category.id}/', {'name': 'Office'}, format='json'
+        ))
+
+    def test_deletion_changes_etags(self):
+        loose = Task.objects.get(title='Loose')
+        self.assert_changed(
+            ['/api/tasks/', '/api/categories/', '/api/tasks/stats/'],
+            lambda: self.client.delete(f'/api/tasks/{loose.id}/')
+        )
+
+
+class ResponseCacheTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # A new time bucket would change the key between two requests.
+        bucket = mock.patch('tasks.views.time_bucket', return_value=0)
+        bucket.start()
+        self.addCleanup(bucket.stop)
+        self.task = Task.objects.create(title='Report', due_date=datetime.now(dt_timezone.utc) + timedelta(seconds=5))
+
+    def get(self, url='/api/tasks/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_repeated_get_is_a_hit(self):
+        for url in ('/api/tasks/', f'/api/tasks/{self.task.id}/'):
+            with self.subTest(url=url):
+                first, second = self.get(url), self.get(url)
+                self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+                self.assertEqual(first.data, second.data)
+        self.assertEqual(response_cache_metrics(), {'hits': 2, 'misses': 2, 'hit_rate': 50.0})
+
+    def test_write_changes_the_key_without_invalidation(self):
+        self.get()
+        # No on_commit callbacks run: nothing is deleted from the cache,
+        # as in a process that did not handle the write.
+        Task.objects.filter(id=self.task.id).update(title='Renamed', change_seq=ChangeCounter.next_value())
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+
+    def test_category_rename_changes_the_key(self):
+        category = Category.objects.create(name='Work')
+        self.task.category = category
+        self.task.save()
+        self.get()
+        category.name = 'Office'
+        category.save()
+        self.assertEqual(self.get().data['results'][0]['category_name'], 'Office')
+
+    def test_hit_refreshes_is_overdue(self):
+        self.assertFalse(self.get().data['results'][0]['is_overdue'])
+        later = self.task.due_date + timedelta(seconds=1)
+        with mock.patch('tasks.response_cache.timezone.now', return_value=later):
+            response = self.get()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertTrue(response.data['results'][0]['is_overdue'])
+
+
+class ChangeFeedTests(TaskAPITestCase):
+    def changes(self, since=None):
+        response = self.client.get('/api/tasks/changes/', {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def titles(self, changes):
+        return [task['title'] for task in changes['changed']]
+
+    def test_first_page_has_every_task_and_no_deletions(self):
+        first, second = Task.objects.create(title='first'), Task.objects.create(title='second')
+        first.delete()
+        changes = self.changes()
+        self.assertEqual((self.titles(changes), changes['deleted']), (['second'], []))
+        self.assertEqual(self.changes(changes['cursor'])['changed'], [])
+
+    def test_writes_and_deletions_after_the_cursor(self):
+        task = Task.objects.create(title='task')
+        doomed = Task.objects.create(title='doomed')
+        cursor = self.changes()['cursor']
+        task.title = 'renamed'
+        task.save()
+        doomed_id = doomed.id
+        doomed.delete()
+        changes = self.changes(cursor)
+        self.assertEqual((self.titles(changes), changes['deleted']), (['renamed'], [doomed_id]))
+
+    def test_bulk_write_stamped_before_the_cursor_is_not_skipped(self):
+        task = Task.objects.create(title='task')
+        stamped = task.updated_at - timedelta(minutes=5)
+        Task.objects.create(title='other')
+        cursor = self.changes()['cursor']
+        # The old (updated_at, id) cursor skipped this: bulk_update_tasks
+        # takes "now" before its transaction commits.
+        with mock.patch('tasks.bulk.timezone.now', return_value=stamped):
+            self.client.patch('/api/tasks/bulk/', {
+                'task_ids': [task.id], 'update_data': {'is_done': True},
+            }, format='json')
+        self.assertEqual(self.titles(self.changes(cursor)), ['task'])
+
+    def test_numbers_above_the_high_water_mark_wait(self):
+        Task.objects.create(title='committed')
+        cursor = self.changes()['cursor']
+        # A row whose transaction's counter update is not visible yet.
+        Task.objects.bulk_create([Task(title='in flight', change_seq=ChangeCounter.current_value() + 1)])
+        changes = self.changes(cursor)
+        self.assertEqual(changes['changed'], [])
+        self.assertEqual(changes['cursor'], cursor)
+        ChangeCounter.next_value()
+        self.assertEqual(self.titles(self.changes(changes['cursor'])), ['in flight'])
+
+    def test_pages_split_one_transaction(self):
+        Task.objects.bulk_create(Task(title=f'task {number}') for number in range(5))
+        self.client.patch('/api/tasks/bulk/', {
+            'task_ids': list(Task.objects.values_list('id', flat=True)), 'update_data': {'priority': 'high'},
+        }, format='json')
+        cursor, seen = None, []
+        for _ in range(3):
+            changes = get_changes(cursor, limit=2)
+            seen += [task.title for task in changes['changed']]
+            cursor = changes['cursor']
+        self.assertFalse(changes['has_more'])
+        self.assertEqual(seen, [f'task {number}' for number in range(5)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tasks/changes/', {'since': 'not a cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskRowRenderingTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        frozen = mock.patch('django.utils.timezone.now', return_value=self.now)
+        frozen.start()
+        self.addCleanup(frozen.stop)
+        work = Category.objects.create(name='Work', color='#FF0000')
+        Task.objects.create(title='Overdue', category=work, due_date=self.now - timedelta(hours=2, minutes=30))
+        Task.objects.create(title='Upcoming', description='with notes', due_date=self.now + timedelta(days=3, hours=1))
+        Task.objects.create(title='Done', category=work, is_done=True, due_date=self.now - timedelta(days=1))
+        Task.objects.create(title='Café   "quoted"', priority='high', order=5)
+        self.renderer = FastJSONRenderer()
+
+    def expected(self, tasks):
+        return TaskSerializer(tasks, many=True).data
+
+    def test_rows_render_like_the_serializer(self):
+        tasks = Task.objects.select_related('category').order_by('id')
+        rows = serialize_task_rows(tasks.values(*TASK_ROW_FIELDS))
+        self.assertEqual(self.renderer.render(rows), self.renderer.render(self.expected(tasks)))
+
+    def test_cursor_pages_render_like_the_serializer(self):
+        tasks = list(Task.objects.select_related('category').order_by(*TaskPagination.keyset_ordering))
+        url = '/api/tasks/?pagination=cursor'
+        with mock.patch.object(TaskPagination, 'page_size', 3):
+            for start in (0, 3):
+                response = self.client.get(url)
+                url = response.json()['next']
+                expected = {'next': url, 'results': self.expected(tasks[start:start + 3])}
+                self.assertEqual(response.content, self.renderer.render(expected))
+        self.assertIsNone(url)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'checks SQLite query plans')
+@skipUnless(orjson, 'orjson is not installed')
+class FastJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeJSONRenderer(self, data, media_type=None):
+        self.assertEqual(FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+
+    def test_same_bytes_as_json_renderer(self):
+        cases = {
+            'unicode': ['Café ☕ \U0001F600', 'line\u2028para\u2029', '\x00\x1f "quoted" \\'],
+            'decimal': [Decimal('1.10'), Decimal('0.1'), Decimal('1E+16'), Decimal('123456789.123456789')],
+            'float': [0.1, 1.0, 33.3, 1e16, 2.5e-7, -1e300],
+            'datetime': [
+                datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+                datetime(2025, 3, 1, 12, 30, tzinfo=dt_timezone(timedelta(hours=2))),
+                datetime(2025, 3, 1), date(2025, 3, 1), time(12, 30, 1, 5), timedelta(days=1, seconds=3),
+            ],
+            'lazy': [gettext_lazy('Invalid cursor'), {'error': gettext_lazy('Not found.')}],
+            'other': [2 ** 70, UUID(int=5), {1: 'a', 'b': None}, None, True, []],
+        }
+        for name, data in cases.items():
+            with self.subTest(name):
+                self.assertRendersLikeJSONRenderer(data)
+
+    def test_indented_output(self):
+        self.assertRendersLikeJSONRenderer({'a': [1, 'é']}, 'application/json; indent=2')
+
+    def test_exponent_lookalikes_in_strings(self):
+        for text in ('#3e8e41', 'client42e', '[1e5', 'x,-2.5e-7'):
+            with self.subTest(text):
+                self.assertRendersLikeJSONRenderer({'title': text, 'values': [1, 0.5]})
+                self.assertEqual(has_exponent_number(orjson.dumps({'title': text})), text.startswith(('[', 'x,')))
+
+
+@override_settings(TASKS_COMPRESSION={'MIN_LENGTH': 1024})
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"title": "task"}' * 200
+
+    def process(self, response, **headers):
+        request = RequestFactory().get('/api/tasks/', **headers)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=None):
+        response = HttpResponse(self.body if body is None else body, content_type='application/json')
+        response['ETag'] = '"v1"'
+        return response
+
+    def test_small_responses_are_left_alone(self):
+        body = self.body[:1023]
+        response = self.process(self.json_response(body), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.content, body)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], '"v1"')
+
+    def test_gzip_weakens_the_etag_and_varies(self):
+        response = self.process(self.json_response(), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['ETag'], 'W/"v1"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_uncompressed_response_still_varies(self):
+        response = self.process(self.json_response())
+        self.assertEqual(response.content, self.body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @skipUnless(brotli, 'brotli is not installed')
+    def test_brotli_when_accepted(self):
+        response = self.process(self.json_response(), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(response['ETag'], 'W/"v1"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_already_encoded_responses_pass_through(self):
+        response = self.json_response()
+        response['Content-Encoding'] = 'identity'
+        response = self.process(response, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual((response['Content-Encoding'], response.content), ('identity', self.body))
+        self.assertEqual(response['ETag'], '"v1"')
+
+    def test_event_streams_pass_through(self):
+        response = StreamingHttpResponse(iter([b'retry: 3000\n\n'] * 200), content_type='text/event-stream')
+        response = self.process(response, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(next(iter(response.streaming_content)), b'retry: 3000\n\n')
+
+
+class DueDateFilterPlanTests(TaskAPITestCase):
+    def plans(self, filter_name):
+        queryset = views.TaskFilter(
+            {filter_name: 'true'}, queryset=views.TaskListCreateView().get_queryset()
+        ).qs
+        # The list page, and the unordered form used for COUNT(*) and ETags.
+        return [queryset.explain(), queryset.order_by().explain()]
+
+    def assert_uses_due_date_index(self, filter_name):
+        due_date_indexes = [index.name for index in Task._meta.indexes if index.fields == ['due_date']]
+        for plan in self.plans(filter_name):
+            with self.subTest(plan=plan):
+                self.assertNotIn('SCAN tasks_task', plan)
+                self.assertTrue(any(f'USING INDEX {name} ' in plan for name in due_date_indexes))
+
+    def test_overdue(self):
+        self.assert_uses_due_date_index('overdue')
+
+    def test_due_today(self):
+        self.assert_uses_due_date_index('due_today')
+
+    def test_due_this_week(self):
+        self.assert_uses_due_date_index('due_this_week')
@@ -5,8 +5,11 @@ urlpatterns = [
     # Tasks
     path('tasks/', views.TaskListCreateView.as_view(), name='task-list-create'),
     path('tasks/<int:id>/', views.TaskRetrieveUpdateDestroyView.as_view(), name='task-detail'),
+    path('tasks/<int:id>/move/', views.move_task, name='task-move'),
+    path('tasks/changes/', views.task_changes, name='task-changes'),
     path('tasks/stats/', views.task_stats, name='task-stats'),
-    path('tasks/bulk/', views.bulk_update_tasks, name='bulk-update-tasks'),
+    path('tasks/bulk/', views.bulk_tasks, name='bulk-tasks'),
+    path('events/', views.task_events, name='task-events'),
     
     # Categories
     path('categories/', views.CategoryListCreateView.as_view(), name='category-list-create'),
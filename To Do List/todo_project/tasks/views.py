@@ -2,17 +2,42 @@ from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from django.db.models import Q, Count
 from datetime import datetime, timedelta
+import asyncio
 import django_filters
 
 from .models import Task, Category
-from .serializers import TaskSerializer, CategorySerializer, TaskStatsSerializer
+from .changes import InvalidCursor, get_changes
+from .events import format_event, get_broker
+from .conditional import (
+    ConditionalGetMixin, category_table_version, make_etag, query_string_key,
+    task_table_version, time_bucket
+)
+from .pagination import TaskPagination
+from .response_cache import CachedResponseMixin
+from .search import TaskSearchFilter
+from . import bulk, ranking
+from .serializers import (
+    TASK_ROW_FIELDS, TaskSerializer, CategorySerializer, TaskStatsSerializer,
+    TaskBulkDeleteSerializer, TaskBulkUpdateSerializer, TaskMoveSerializer,
+    serialize_task_rows
+)
+from .stats import get_task_stats
 
 
 # Task Filtering
+def local_day_start(now):
+    return timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
 class TaskFilter(django_filters.FilterSet):
     priority = django_filters.ChoiceFilter(choices=Task.PRIORITY_CHOICES)
     category = django_filters.NumberFilter(field_name='category__id')
@@ -25,9 +50,15 @@ class TaskFilter(django_filters.FilterSet):
         model = Task
         fields = ['priority', 'category', 'is_done']
     
+    # Plain ranges on due_date rather than __date lookups, which wrap the
+    # column in a function and so cannot use its indexes.
     def filter_overdue(self, queryset, name, value):
         if value:
+            # due_date__isnull=False is implied by the upper bound, but as a
+            # lower bound it makes SQLite pick the pending due-date index
+            # over walking the list-ordering index.
             return queryset.filter(
+                due_date__isnull=False,
                 due_date__lt=timezone.now(),
                 is_done=False
             )
@@ -35,50 +66,132 @@ class TaskFilter(django_filters.FilterSet):
     
     def filter_due_today(self, queryset, name, value):
         if value:
-            today = timezone.now().date()
-            return queryset.filter(due_date__date=today)
+            today_start = local_day_start(timezone.now())
+            return queryset.filter(
+                due_date__gte=today_start,
+                due_date__lt=today_start + timedelta(days=1)
+            )
         return queryset
     
     def filter_due_this_week(self, queryset, name, value):
         if value:
-            today = timezone.now().date()
-            week_end = today + timedelta(days=7)
+            # Today and the following seven days.
+            today_start = local_day_start(timezone.now())
             return queryset.filter(
-                due_date__date__range=[today, week_end]
+                due_date__gte=today_start,
+                due_date__lt=today_start + timedelta(days=8)
             )
         return queryset
 
 
 # Task Views
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskRowListMixin:
+    """List tasks from values() rows through serialize_task_rows().
+    
+    Same output as listing with TaskSerializer, without building a model
+    instance and a set of field objects for every row.
+    """
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(*TASK_ROW_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_task_rows(page))
+        return Response(serialize_task_rows(queryset))
+
+
+class TaskListCreateView(ConditionalGetMixin, CachedResponseMixin, TaskRowListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, TaskSearchFilter]
     filterset_class = TaskFilter
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'due_date', 'priority', 'order']
     ordering = ['order', '-created_at']
+    pagination_class = TaskPagination
     permission_classes = [AllowAny]
     
     def get_queryset(self):
         return Task.objects.all().select_related('category')
+    
+    def get_etag(self, request, *args, **kwargs):
+        return make_etag(
+            query_string_key(request),
+            time_bucket(timezone.now()),
+            task_table_version(),
+            category_table_version()
+        )
 
 
-class TaskRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class TaskRetrieveUpdateDestroyView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     lookup_field = 'id'
     permission_classes = [AllowAny]
     
     def get_queryset(self):
         return Task.objects.all().select_related('category')
+    
+    def get_object(self):
+        # get_etag() and the response share one lookup.
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+    
+    def get_etag(self, request, *args, **kwargs):
+        task = self.get_object()
+        return make_etag(
+            task.pk,
+            task.updated_at,
+            task.category.updated_at if task.category else None,
+            task.is_overdue,
+            task.days_until_due
+        )
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def move_task(request, id):
+    task = get_object_or_404(Task, id=id)
+    serializer = TaskMoveSerializer(data=request.data, context={'task': task})
+    serializer.is_valid(raise_exception=True)
+    after = serializer.validated_data.get('after')
+    before = serializer.validated_data.get('before')
+    
+    try:
+        ranking.move_task(
+            task,
+            after_id=after.id if after else None,
+            before_id=before.id if before else None
+        )
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(TaskSerializer(task, context={'request': request}).data)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def task_changes(request):
+    try:
+        changes = get_changes(request.query_params.get('since') or None)
+    except InvalidCursor as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    changes['changed'] = TaskSerializer(
+        changes['changed'], many=True, context={'request': request}
+    ).data
+    return Response(changes)
 
 
 # Category Views
-class CategoryListCreateView(generics.ListCreateAPIView):
+class CategoryListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
     
     def get_queryset(self):
-        return Category.objects.all().prefetch_related('tasks')
+        return Category.objects.with_pending_task_count().order_by('name')
+    
+    def get_etag(self, request, *args, **kwargs):
+        return make_etag(query_string_key(request), category_table_version(), task_table_version())
 
 
 class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
@@ -87,77 +200,124 @@ class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [AllowAny]
     
     def get_queryset(self):
-        return Category.objects.all().prefetch_related('tasks')
+        return Category.objects.with_pending_task_count().order_by('name')
 
 
 # Task Statistics
+def task_stats_etag(request):
+    return make_etag(sorted(get_task_stats().items()))
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@condition(etag_func=task_stats_etag)
 def task_stats(request):
-    total = Task.objects.count()
-    completed = Task.objects.filter(is_done=True).count()
-    pending = total - completed
-    
-    # Calculate overdue tasks
-    overdue = Task.objects.filter(
-        due_date__lt=timezone.now(),
-        is_done=False
-    ).count()
-    
-    # Calculate completion rate
-    completion_rate = (completed / total * 100) if total > 0 else 0
-    
-    # Today's completed tasks
-    today = timezone.now().date()
-    today_completed = Task.objects.filter(
-        completed_at__date=today
-    ).count()
-    
-    # This week's completed tasks
-    week_start = today - timedelta(days=today.weekday())
-    this_week_completed = Task.objects.filter(
-        completed_at__date__gte=week_start
-    ).count()
-    
-    stats = {
-        'total': total,
-        'completed': completed,
-        'pending': pending,
-        'overdue': overdue,
-        'completion_rate': round(completion_rate, 1),
-        'today_completed': today_completed,
-        'this_week_completed': this_week_completed,
-    }
-    
+    stats = get_task_stats()
     serializer = TaskStatsSerializer(stats)
-    return Response(serializer.data)
+    response = Response(serializer.data)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+# Server-Sent Events
+EVENT_KEEPALIVE_SECONDS = 15
+
+
+async def task_events(request):
+    """Stream task and category changes to the client as Server-Sent Events.
+    
+    Only served under ASGI (todo_project.asgi, which runserver uses once
+    daphne is installed). Under WSGI Django would try to read the endless
+    stream to the end, holding a worker thread and never answering, so the
+    request is refused and the client falls back to polling.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'Live updates are only available when served through ASGI.'},
+            status=503
+        )
+    
+    async def stream():
+        yield 'retry: 3000\n\n'
+        async with get_broker().subscribe() as queue:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield format_event(event)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 # Bulk Operations
-@api_view(['PATCH'])
+@api_view(['POST', 'PATCH', 'DELETE'])
 @permission_classes([AllowAny])
-def bulk_update_tasks(request):
-    task_ids = request.data.get('task_ids', [])
-    update_data = request.data.get('update_data', {})
-    
-    if not task_ids:
+def bulk_tasks(request):
+    handlers = {
+        'POST': _bulk_create_tasks,
+        'PATCH': _bulk_update_tasks,
+        'DELETE': _bulk_delete_tasks,
+    }
+    return handlers[request.method](request)
+
+
+def _bulk_create_tasks(request):
+    if not isinstance(request.data, list) or not request.data:
         return Response(
-            {'error': 'task_ids is required'}, 
+            {'error': 'A non-empty list of tasks is required'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    tasks = Task.objects.filter(id__in=task_ids)
+    serializer = TaskSerializer(
+        data=request.data,
+        many=True,
+        max_length=bulk.BULK_MAX_TASKS,
+        context={'request': request, 'categories': Category.objects.in_bulk()}
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+def _bulk_update_tasks(request):
+    serializer = TaskBulkUpdateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    results = bulk.bulk_update_tasks(
+        serializer.validated_data['task_ids'],
+        serializer.validated_data['update_data']
+    )
+    updated_count = sum(1 for result in results.values() if result == 'updated')
     
-    if not tasks.exists():
+    if not updated_count:
         return Response(
             {'error': 'No tasks found'}, 
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Update tasks
-    updated_count = tasks.update(**update_data)
-    
     return Response({
         'message': f'Updated {updated_count} tasks',
-        'updated_count': updated_count
+        'updated_count': updated_count,
+        'results': [
+            {'id': task_id, 'status': result} for task_id, result in results.items()
+        ]
+    })
+
+
+def _bulk_delete_tasks(request):
+    serializer = TaskBulkDeleteSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    results = bulk.bulk_delete_tasks(serializer.validated_data['task_ids'])
+    deleted_count = sum(1 for result in results.values() if result == 'deleted')
+    
+    return Response({
+        'message': f'Deleted {deleted_count} tasks',
+        'deleted_count': deleted_count,
+        'results': [
+            {'id': task_id, 'status': result} for task_id, result in results.items()
+        ]
     })
@@ -18,6 +18,8 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 
 # Application definition
 INSTALLED_APPS = [
+    # Makes runserver serve ASGI, which the /api/events/ stream needs.
+    'daphne',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -32,6 +34,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'tasks.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,6 +63,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'todo_project.wsgi.application'
+ASGI_APPLICATION = 'todo_project.asgi.application'
 
 # Database
 DATABASES = {
@@ -104,6 +108,11 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed when the orjson package is installed, stdlib json otherwise.
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -111,6 +120,37 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Fan-out for the /api/events/ stream. Use tasks.events.RedisBroker with
+# OPTIONS {'url': 'redis://...'} when running more than one worker process.
+TASKS_EVENT_BROKER = {
+    'BACKEND': 'tasks.events.InProcessBroker',
+    'OPTIONS': {},
+}
+
+# The task statistics snapshot and the task response cache live here. The
+# local memory cache is per process; with several workers use a shared
+# backend such as django.core.cache.backends.redis.RedisCache with
+# LOCATION 'redis://...'.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Serialized task list pages and task details, keyed by the ETag they are
+# served with. TIMEOUT only bounds how long retired entries use memory.
+TASKS_RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 60,
+}
+
+# Responses smaller than MIN_LENGTH bytes are sent uncompressed. Brotli is
+# used when the brotli package is installed and the client accepts it.
+TASKS_COMPRESSION = {
+    'MIN_LENGTH': 1024,
+    'BROTLI_QUALITY': 5,
+}
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
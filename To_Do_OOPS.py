@@ -1,14 +1,89 @@
 import os
+import re
+import sys
+import heapq
 import json
-from datetime import datetime, timedelta
+import sqlite3
+from bisect import bisect_left, insort
+from collections.abc import MutableSequence
+from contextlib import nullcontext
+from itertools import islice
+from datetime import date, datetime, timedelta
+from json.encoder import encode_basestring_ascii
+
+from task_cli import TaskBackend, run
+from task_stats import NO_DUE_DATE, compute_stats
+
+JSON_CHUNK_SIZE = 1 << 20
+JSON_WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+PRIORITIES = ("High", "Medium", "Low")
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}
+SECONDS_PER_DAY = 86400
+VIEW_PAGE_SIZE = 20  # tasks per page, and N for the "next N due" view
+
+def _timestamp_seconds(moment):
+    return moment.toordinal() * SECONDS_PER_DAY + moment.hour * 3600 + moment.minute * 60 + moment.second
 
 class Task:
-    def __init__(self, description, due_date=None, priority="Medium", completed=False):
+    # Dates are kept as day ordinals, created_at as whole seconds since
+    # 0001-01-01 and known priorities as small ints. Values that do not
+    # parse are kept verbatim so to_dict() always round-trips.
+    __slots__ = ("description", "_due", "_priority", "completed", "_created", "id")
+
+    def __init__(self, description, due_date=None, priority="Medium", completed=False, created_at=None):
         self.description = description
         self.due_date = due_date
         self.priority = priority
         self.completed = completed
-        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if created_at is None:
+            self._created = _timestamp_seconds(datetime.now())
+        else:
+            self.created_at = created_at
+        self.id = None  # storage key; not part of to_dict()
+
+    @property
+    def due_date(self):
+        due = self._due
+        return date.fromordinal(due).isoformat() if due.__class__ is int else due
+
+    @due_date.setter
+    def due_date(self, value):
+        try:
+            self._due = date.fromisoformat(value).toordinal() if value and len(value) == 10 else value
+        except (TypeError, ValueError):
+            self._due = value
+
+    @property
+    def due_ordinal(self):
+        """The due date as a day ordinal, or None if it is unset or unparseable."""
+        return self._due if self._due.__class__ is int else None
+
+    @property
+    def priority(self):
+        priority = self._priority
+        return PRIORITIES[priority] if priority.__class__ is int else priority
+
+    @priority.setter
+    def priority(self, value):
+        self._priority = PRIORITY_CODES.get(value, value)
+
+    @property
+    def created_at(self):
+        created = self._created
+        if created.__class__ is not int:
+            return created
+        day, seconds = divmod(created, SECONDS_PER_DAY)
+        return f"{date.fromordinal(day).isoformat()} {seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+    @created_at.setter
+    def created_at(self, value):
+        try:
+            # Only the "YYYY-MM-DD HH:MM:SS" layout Task writes is compacted.
+            if len(value) != 19 or value[10] != " ":
+                raise ValueError
+            self._created = _timestamp_seconds(datetime.fromisoformat(value))
+        except (TypeError, ValueError):
+            self._created = value
 
     def to_dict(self):
         return {
@@ -21,19 +96,374 @@ class Task:
 
     @classmethod
     def from_dict(cls, data):
-        task = cls(data["description"])
-        task.due_date = data["due_date"]
-        task.priority = data["priority"]
-        task.completed = data["completed"]
-        task.created_at = data["created_at"]
+        return cls(data["description"], data["due_date"], data["priority"], data["completed"], data["created_at"])
+
+
+TASK_FIELDS = ("description", "due_date", "priority", "completed", "created_at")
+
+
+def task_record(task):
+    """The task's TASK_FIELDS values as a tuple, the form LazyTaskList loads them in."""
+    return (task.description, task.due_date, task.priority, task.completed, task.created_at)
+
+
+def iter_json_array(file, chunk_size=JSON_CHUNK_SIZE):
+    """Yield the elements of a top-level JSON array without reading the whole file at once.
+
+    Raises ValueError for anything json.load would reject: a missing or
+    unterminated array, separators other than single commas between
+    elements, or data after the closing bracket.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    # What comes next: the "[" opening the array, its first element or
+    # "]", an element after a comma, a comma or "]" after an element, and
+    # only whitespace once the array is closed.
+    expect = "["
+    while True:
+        pos = JSON_WHITESPACE_RE.match(buffer, pos).end()
+        if pos < len(buffer):
+            if expect == "element":
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if buffer[pos] in ",]":
+                        raise ValueError(f"Expected an array element at offset {pos}")
+                    if eof:
+                        raise
+                else:
+                    # Only trust an element once the character after it is seen;
+                    # a number cut by the chunk boundary still decodes as a prefix.
+                    following = buffer[end] if end < len(buffer) else ""
+                    if following == ",":
+                        # The comma save_all writes straight after each element.
+                        yield item
+                        pos = end + 1
+                        continue
+                    if following in " \t\r\n]" and (following or eof):
+                        yield item
+                        pos = end
+                        expect = "separator"
+                        continue
+                    if eof:
+                        raise ValueError(f"Expected ',' or ']' at offset {end}")
+            else:
+                char = buffer[pos]
+                if expect == "[":
+                    if char != "[":
+                        raise ValueError("Expected a JSON array")
+                    expect = "first"
+                elif char == "]" and expect in ("first", "separator"):
+                    expect = "end"
+                elif char == "," and expect == "separator":
+                    expect = "element"
+                elif expect == "first":
+                    expect = "element"
+                    continue
+                elif expect == "end":
+                    raise ValueError(f"Extra data after the JSON array at offset {pos}")
+                else:
+                    raise ValueError(f"Expected ',' or ']' at offset {pos}")
+                pos += 1
+                continue
+        elif eof:
+            if expect == "end":
+                return
+            raise ValueError("Expected a JSON array" if expect == "[" else "Unterminated JSON array")
+        # pos is only 0 here if nothing was parsed since the last read: an
+        # element longer than the buffer. Reading twice the buffer then
+        # copies and decodes it a bounded number of times, not once per chunk.
+        chunk = file.read(chunk_size if pos else max(chunk_size, 2 * len(buffer)))
+        eof = not chunk
+        # Strings cannot grow in place, so appending copies the buffer
+        # anyway; dropping what was parsed in the same copy keeps it short.
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _json_value(value):
+    # Task fields are flat; strings skip the overhead of a json.dumps call.
+    if value.__class__ is str:
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True or value is False:
+        return "true" if value else "false"
+    return json.dumps(value)
+
+
+class LazyTaskList(MutableSequence):
+    """A list of tasks that keeps loaded entries as plain tuples.
+
+    A ``Task`` is only built when an entry is accessed, and saving writes
+    untouched entries straight back without building one.
+    """
+
+    def __init__(self, entries=()):
+        self._entries = list(entries)
+
+    def _task(self, index):
+        entry = self._entries[index]
+        if not isinstance(entry, Task):
+            entry = self._entries[index] = Task(*entry)
+        return entry
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._task(i) for i in range(*index.indices(len(self._entries)))]
+        return self._task(index)
+
+    def __setitem__(self, index, task):
+        self._entries[index] = task
+
+    def __delitem__(self, index):
+        del self._entries[index]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def insert(self, index, task):
+        self._entries.insert(index, task)
+
+    def pop(self, index=-1):
+        task = self._task(index)
+        del self._entries[index]
         return task
 
+    def sort(self, key=None, reverse=False):
+        tasks = self[:]
+        tasks.sort(key=key, reverse=reverse)
+        self._entries = tasks
+
+    def iter_dicts(self):
+        for entry in self._entries:
+            yield entry.to_dict() if isinstance(entry, Task) else dict(zip(TASK_FIELDS, entry))
+
+    def iter_records(self):
+        """Yield every task as a TASK_FIELDS tuple, without building a Task."""
+        for entry in self._entries:
+            yield task_record(entry) if isinstance(entry, Task) else entry
+
+
+class JSONStorage:
+    """Whole list in one JSON file, rewritten on every change."""
+
+    def __init__(self, filename="tasks.json"):
+        self.filename = filename
+        self.deferred = False
+
+    def load(self):
+        if not os.path.exists(self.filename):
+            return LazyTaskList()
+        with open(self.filename, "r") as file:
+            return LazyTaskList(tuple(data[field] for field in TASK_FIELDS) for data in iter_json_array(file))
+
+    def save_all(self, tasks):
+        dicts = tasks.iter_dicts() if isinstance(tasks, LazyTaskList) else (task.to_dict() for task in tasks)
+        # Same layout as json.dump(..., indent=2), written one task at a time.
+        with open(self.filename, "w") as file:
+            separator = "[\n  "
+            for data in dicts:
+                fields = ",\n    ".join(f"{_json_value(key)}: {_json_value(value)}" for key, value in data.items())
+                file.write(f"{separator}{{\n    {fields}\n  }}")
+                separator = ",\n  "
+            file.write("[]" if separator == "[\n  " else "\n]")
+
+    def defer_writes(self):
+        """Hold changes in memory until flush()."""
+        self.deferred = True
+
+    def flush(self, tasks):
+        self.deferred = False
+        self.save_all(tasks)
+
+    def add(self, tasks, task):
+        if not self.deferred:
+            self.save_all(tasks)
+
+    def update(self, tasks, task):
+        if not self.deferred:
+            self.save_all(tasks)
+
+    def remove(self, tasks, task):
+        if not self.deferred:
+            self.save_all(tasks)
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage:
+    """One row per task in an SQLite database; each change writes only its row."""
+
+    def __init__(self, filename="tasks.db"):
+        self.deferred = False
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    description TEXT NOT NULL,
+                    due_date TEXT,
+                    priority TEXT NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS tasks_due_date_idx ON tasks (due_date);
+                CREATE INDEX IF NOT EXISTS tasks_priority_idx ON tasks (priority);
+                CREATE INDEX IF NOT EXISTS tasks_completed_idx ON tasks (completed);
+            """)
+
+    def load(self):
+        tasks = []
+        rows = self.connection.execute(
+            "SELECT id, description, due_date, priority, completed, created_at FROM tasks ORDER BY id")
+        for task_id, description, due_date, priority, completed, created_at in rows:
+            task = Task(description, due_date, priority, bool(completed), created_at)
+            task.id = task_id
+            tasks.append(task)
+        return tasks
+
+    def defer_writes(self):
+        """Keep changes in one open transaction until flush()."""
+        self.deferred = True
+
+    def flush(self, tasks):
+        self.deferred = False
+        self.connection.commit()
+
+    def _transaction(self):
+        # The connection context manager commits on exit; while deferred the
+        # implicit transaction is left open instead.
+        return nullcontext() if self.deferred else self.connection
+
+    def _row(self, task):
+        return (task.description, task.due_date, task.priority, int(task.completed), task.created_at)
+
+    def save_all(self, tasks):
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            for task in tasks:
+                task.id = self.connection.execute(
+                    "INSERT INTO tasks (description, due_date, priority, completed, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)", self._row(task)).lastrowid
+
+    def add(self, tasks, task):
+        with self._transaction():
+            task.id = self.connection.execute(
+                "INSERT INTO tasks (description, due_date, priority, completed, created_at) "
+                "VALUES (?, ?, ?, ?, ?)", self._row(task)).lastrowid
+
+    def update(self, tasks, task):
+        with self._transaction():
+            self.connection.execute(
+                "UPDATE tasks SET description = ?, due_date = ?, priority = ?, completed = ?, created_at = ? "
+                "WHERE id = ?", self._row(task) + (task.id,))
+
+    def remove(self, tasks, task):
+        with self._transaction():
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (task.id,))
+
+    def close(self):
+        self.connection.close()
+
+
+# Sort orders offered by view_tasks, as keys of TASK_FIELDS tuples so that
+# loaded tasks are indexed without building a Task. Ties keep the order
+# tasks were added in.
+SORT_KEYS = {
+    "date": lambda record: (record[1] is None, record[1] or ""),
+    "priority": lambda record: PRIORITY_CODES.get(record[2], len(PRIORITIES)),
+}
+
+
 class ToDoList:
-    def __init__(self):
+    def __init__(self, storage=None):
         self.tasks = []
-        self.filename = "tasks.json"
+        self.storage = storage or JSONStorage()
         self.load_tasks()
 
+    def _reset_indexes(self):
+        # Sorted indexes of (sort key, serial), built on first use and then
+        # kept up to date with bisect. Serials are handed out in the order
+        # tasks are added and _serials lists those of self.tasks in order,
+        # so a task's number is found by bisecting it for the serial.
+        self._indexes = {}
+        self._serials = []
+        self._next_serial = 0
+
+    def _records(self):
+        tasks = self.tasks
+        return tasks.iter_records() if isinstance(tasks, LazyTaskList) else map(task_record, tasks)
+
+    def sorted_tasks(self, sort_by, start=0, stop=None):
+        """Return (number, task) pairs in the given SORT_KEYS order without reordering self.tasks.
+
+        Numbers are positions in self.tasks, as in the unsorted view.
+        """
+        index = self._indexes.get(sort_by)
+        if index is None:
+            if not self._indexes:
+                self._serials = list(range(len(self.tasks)))
+                self._next_serial = len(self.tasks)
+            key = SORT_KEYS[sort_by]
+            index = self._indexes[sort_by] = sorted(
+                (key(record), serial) for serial, record in zip(self._serials, self._records()))
+        numbers = [bisect_left(self._serials, serial) for _, serial in index[start:stop]]
+        return [(number + 1, self.tasks[number]) for number in numbers]
+
+    def next_due(self, n=VIEW_PAGE_SIZE):
+        pending = ((idx, task) for idx, task in enumerate(self.tasks, 1)
+                   if not task.completed and task.due_ordinal is not None)
+        return heapq.nsmallest(n, pending, key=lambda item: item[1].due_ordinal)
+
+    def find(self, text, n=VIEW_PAGE_SIZE):
+        text = text.lower()
+        return list(islice(((idx, task) for idx, task in enumerate(self.tasks, 1)
+                            if text in task.description.lower()), n))
+
+    def _index_add(self, task):
+        if not self._indexes:
+            return
+        serial = self._next_serial
+        self._next_serial += 1
+        self._serials.append(serial)
+        record = task_record(task)
+        for sort_by, index in self._indexes.items():
+            insort(index, (SORT_KEYS[sort_by](record), serial))
+
+    def _index_remove(self, position, task):
+        if not self._indexes:
+            return
+        serial = self._serials.pop(position)
+        record = task_record(task)
+        for sort_by, index in self._indexes.items():
+            del index[bisect_left(index, (SORT_KEYS[sort_by](record), serial))]
+
+    def add(self, description, due_date=None, priority="Medium"):
+        task = Task(description, due_date, priority)
+        self.tasks.append(task)
+        self._index_add(task)
+        self.storage.add(self.tasks, task)
+        return task
+
+    def remove(self, index):
+        task = self.tasks.pop(index)
+        self._index_remove(index, task)
+        self.storage.remove(self.tasks, task)
+        return task
+
+    def complete(self, index):
+        task = self.tasks[index]
+        # Neither sort key depends on completion, so the indexes stay valid.
+        task.completed = True
+        self.storage.update(self.tasks, task)
+        return task
+
     def add_task(self):
         description = input("Enter task description: ")
         due_date = input("Enter due date (YYYY-MM-DD) or press Enter for no due date: ")
@@ -46,9 +476,7 @@ class ToDoList:
                 print("Invalid date format. Task will be created without a due date.")
                 due_date = None
 
-        task = Task(description, due_date, priority)
-        self.tasks.append(task)
-        self.save_tasks()
+        self.add(description, due_date, priority)
         print(f"Task '{description}' added successfully!")
 
     def view_tasks(self):
@@ -56,30 +484,48 @@ class ToDoList:
             print("No tasks to show!")
             return
 
-        sort_by = input("Sort by (date/priority/none) [none]: ").lower() or "none"
-        if sort_by == "date":
-            self.tasks.sort(key=lambda x: (x.due_date is None, x.due_date))
-        elif sort_by == "priority":
-            priority_order = {"High": 0, "Medium": 1, "Low": 2}
-            self.tasks.sort(key=lambda x: priority_order[x.priority])
+        sort_by = input(f"Sort by (date/priority/none) [none], or 'next' for the next {VIEW_PAGE_SIZE} due: ").lower() or "none"
+        if sort_by == "next":
+            write_tasks(self.next_due())
+            return
+
+        start, stop, footer = 0, None, None
+        if len(self.tasks) > VIEW_PAGE_SIZE:
+            pages = (len(self.tasks) + VIEW_PAGE_SIZE - 1) // VIEW_PAGE_SIZE
+            page = input(f"Page (1-{pages}) [1]: ")
+            page = int(page) if page.isdigit() and 0 < int(page) <= pages else 1
+            start, stop = (page - 1) * VIEW_PAGE_SIZE, page * VIEW_PAGE_SIZE
+            footer = f"(page {page} of {pages}, {len(self.tasks)} tasks)"
 
-        print("\nYour Tasks:")
-        for idx, task in enumerate(self.tasks, 1):
-            status = "✓" if task.completed else "✗"
-            due = f"Due: {task.due_date}" if task.due_date else "No due date"
-            print(f"{idx}. [{status}] {task.description} - Priority: {task.priority}, {due}")
+        if sort_by in SORT_KEYS:
+            # Tasks keep their numbers from self.tasks whatever the order shown.
+            listing = self.sorted_tasks(sort_by, start, stop)
+        else:
+            listing = zip(range(start + 1, len(self.tasks) + 1), self.tasks[start:stop])
+        write_tasks(listing, footer)
+
+    def ask_task_number(self, action):
+        """Prompt for a task number; long lists are only listed or searched on request."""
+        if len(self.tasks) <= VIEW_PAGE_SIZE:
+            self.view_tasks()
+        while True:
+            answer = input(f"Enter the task number to {action} ('?' to list, '/text' to search): ").strip()
+            if answer == "?":
+                self.view_tasks()
+            elif answer.startswith("/"):
+                write_tasks(self.find(answer[1:]))
+            else:
+                return int(answer)
 
     def remove_task(self):
         if not self.tasks:
             print("No tasks to remove!")
             return
 
-        self.view_tasks()
         try:
-            task_num = int(input("Enter the task number to remove: "))
+            task_num = self.ask_task_number("remove")
             if 0 < task_num <= len(self.tasks):
-                removed_task = self.tasks.pop(task_num - 1)
-                self.save_tasks()
+                removed_task = self.remove(task_num - 1)
                 print(f"Task '{removed_task.description}' removed successfully!")
             else:
                 print("Invalid task number!")
@@ -91,13 +537,10 @@ class ToDoList:
             print("No tasks to mark as completed!")
             return
 
-        self.view_tasks()
         try:
-            task_num = int(input("Enter the task number to mark as completed: "))
+            task_num = self.ask_task_number("mark as completed")
             if 0 < task_num <= len(self.tasks):
-                task = self.tasks[task_num - 1]
-                task.completed = True
-                self.save_tasks()
+                task = self.complete(task_num - 1)
                 print(f"Task '{task.description}' marked as completed!")
             else:
                 print("Invalid task number!")
@@ -105,40 +548,95 @@ class ToDoList:
             print("Please enter a valid number!")
 
     def save_tasks(self):
-        with open(self.filename, "w") as file:
-            json.dump([task.to_dict() for task in self.tasks], file, indent=2)
+        self.storage.save_all(self.tasks)
 
     def load_tasks(self):
-        if os.path.exists(self.filename):
-            with open(self.filename, "r") as file:
-                data = json.load(file)
-                self.tasks = [Task.from_dict(task_data) for task_data in data]
+        self.tasks = self.storage.load()
+        self._reset_indexes()
+
+    def statistics(self):
+        tasks = self.tasks
+        return compute_stats([task.completed for task in tasks],
+                             [task.due_ordinal or NO_DUE_DATE for task in tasks],
+                             [task.priority for task in tasks])
 
     def show_statistics(self):
-        total_tasks = len(self.tasks)
-        completed_tasks = sum(1 for task in self.tasks if task.completed)
-        pending_tasks = total_tasks - completed_tasks
+        stats = self.statistics()
         
         print("\nTask Statistics:")
-        print(f"Total tasks: {total_tasks}")
-        print(f"Completed tasks: {completed_tasks}")
-        print(f"Pending tasks: {pending_tasks}")
+        print(f"Total tasks: {stats['total']}")
+        print(f"Completed tasks: {stats['completed']}")
+        print(f"Pending tasks: {stats['pending']}")
         
-        if total_tasks > 0:
-            completion_rate = (completed_tasks / total_tasks) * 100
-            print(f"Completion rate: {completion_rate:.2f}%")
+        if stats['total'] > 0:
+            print(f"Completion rate: {stats['completion_rate']:.2f}%")
+
+        print(f"Overdue tasks: {stats['overdue']}")
+        print(f"Due today: {stats['due_today']}, due in the next week: {stats['due_soon']}, "
+              f"later: {stats['due_later']}, no due date: {stats['no_due_date']}")
+        for priority, counts in sorted(stats['by_priority'].items(), key=lambda item: PRIORITY_CODES.get(item[0], len(PRIORITIES))):
+            print(f"{priority} priority: {counts['completed']}/{counts['total']} completed")
+
+class BatchBackend(TaskBackend):
+    """task_cli commands over a ToDoList; storage writes are held until save()."""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def load(self):
+        self.todo_list = ToDoList(self.storage)
+        self.storage.defer_writes()
+
+    def save(self):
+        self.storage.flush(self.todo_list.tasks)
+
+    def close(self):
+        self.storage.close()
+
+    def records(self):
+        tasks = self.todo_list.tasks
+        return list(tasks.iter_dicts()) if isinstance(tasks, LazyTaskList) else [task.to_dict() for task in tasks]
+
+    def add(self, description, due_date=None, priority="Medium", completed=False):
+        task = self.todo_list.add(description, due_date, priority)
+        if completed:
+            self.todo_list.complete(len(self.todo_list.tasks) - 1)
+        return task.to_dict()
+
+    def complete(self, number):
+        return self.todo_list.complete(self.check_number(number, len(self.todo_list.tasks))).to_dict()
+
+    def remove(self, number):
+        return self.todo_list.remove(self.check_number(number, len(self.todo_list.tasks))).to_dict()
+
+    def stats(self):
+        return self.todo_list.statistics()
+
+def default_storage():
+    # TODO_STORAGE=sqlite keeps tasks in tasks.db instead of tasks.json
+    return SQLiteStorage() if os.environ.get("TODO_STORAGE") == "sqlite" else JSONStorage()
 
-        overdue_tasks = sum(1 for task in self.tasks if task.due_date and not task.completed and datetime.strptime(task.due_date, "%Y-%m-%d").date() < datetime.now().date())
-        print(f"Overdue tasks: {overdue_tasks}")
+def write_tasks(numbered_tasks, footer=None):
+    # One write for the whole listing instead of a print per task.
+    lines = ["", "Your Tasks:"]
+    for idx, task in numbered_tasks:
+        status = "✓" if task.completed else "✗"
+        due = f"Due: {task.due_date}" if task.due_date else "No due date"
+        lines.append(f"{idx}. [{status}] {task.description} - Priority: {task.priority}, {due}")
+    if footer:
+        lines.append(footer)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def display_menu():
     print("\n---- To-Do List ----""\n1. Add Task""\n2. View Tasks""\n3. Remove Task""\n4. Mark Task as Completed""\n5. Show Statistics""\n6. Exit")
 
 def main():
-    todo_list = ToDoList()
+    if len(sys.argv) > 1:
+        sys.exit(run(BatchBackend(default_storage()), prog="To_Do_OOPS.py"))
+    todo_list = ToDoList(default_storage())
     menu_options = {'1': todo_list.add_task, '2': todo_list.view_tasks, '3': todo_list.remove_task,
                     '4': todo_list.mark_completed, '5': todo_list.show_statistics,
-                    '6': lambda: [print("Exiting To-Do List. Goodbye!"), exit()]}
+                    '6': lambda: [print("Exiting To-Do List. Goodbye!"), todo_list.storage.close(), exit()]}
     while True:
         display_menu()
         choice = input("Enter your choice: ")
@@ -1,66 +1,130 @@
 import streamlit as st
 import os
 
+import To_do
+from shared_storage import VersionConflict, append_line, create_file, read_file, replace_file
+
 st.markdown("<h2 style='text-align: center;'>📝 To-Do App</h2>", unsafe_allow_html=True)
 
-task_file = 'tasks.txt'
+# One task per line. Not tasks.txt: To_do.py keeps that as CSV with a
+# journal of changes by position, which plain-line edits would corrupt.
+task_file = 'app_tasks.txt'
+SELECTBOX_LIMIT = 1000  # longer lists pick tasks by number instead of a dropdown
+
+def shared_file_tasks():
+    """Task texts in tasks.txt, where the app kept its tasks before task_file.
 
-# Ensure task file exists
+    To_do.py's current format is read with its journal replayed. Otherwise
+    the file may mix To_do.py's old rows with the app's plain lines, so a
+    line that does not parse as a row is taken as a task as it stands.
+    """
+    text, _ = read_file(To_do.TASKS_FILE)
+    if text.startswith(To_do.FORMAT_HEADER):
+        journal = To_do.TaskJournal()
+        journal.read()
+        texts = [task_info['task'] for task_info in journal.tasks]
+    else:
+        texts = []
+        deadlines = {}
+        for line in text.split('\n'):
+            if not line.strip() or line.startswith(To_do.LEGACY_SEQ_HEADER):
+                continue
+            try:
+                texts.append(To_do._parse_legacy_line(line, deadlines)['task'])
+            except ValueError:
+                texts.append(line)
+    # One line per task, so any line breaks in To_do.py's task text go.
+    return [' '.join(task.split()) for task in texts if task.strip()]
+
+# Start the app's file from tasks.txt, once.
 if not os.path.exists(task_file):
-    open(task_file, 'w').close()
+    create_file(task_file, ''.join(task + '\n' for task in shared_file_tasks()))
+
+# Success message carried over the rerun that follows a change.
+if 'flash' in st.session_state:
+    st.success(st.session_state.pop('flash'))
 
 taskbox = st.selectbox('Choose an action:', ['Add Task', 'Update Task', 'Remove Task', 'View Tasks'])
 
+@st.cache_data(max_entries=4)
+def read_tasks(path, mtime_ns, size):
+    # mtime and size are only part of the cache key: any write to the file
+    # changes them, so a rerun re-reads the file only after it changed.
+    text, version = read_file(path)
+    return [task.strip() for task in text.split('\n') if task.strip()], version
+
 def load_tasks():
-    with open(task_file, 'r') as file:
-        return [task.strip() for task in file.readlines() if task.strip()]
+    """Return the tasks and the file version this session last showed.
+
+    Other sessions may write between the run that drew the page and the
+    run that handles a click, so edits are checked against the version
+    the user was looking at rather than the one just loaded.
+    """
+    stat = os.stat(task_file)
+    tasks, version = read_tasks(task_file, stat.st_mtime_ns, stat.st_size)
+    shown_version = st.session_state.get('tasks_version', version)
+    st.session_state['tasks_version'] = version
+    return tasks, shown_version
+
+def save_tasks(tasks, version, message):
+    try:
+        replace_file(task_file, ''.join(task + '\n' for task in tasks), version)
+    except VersionConflict:
+        st.error("⚠️ The task list was changed by someone else. Please check it and try again.")
+        return
+    # Redraw at once: the widgets on this run still show the old list.
+    st.session_state['flash'] = message
+    st.rerun()
+
+def append_task(task):
+    append_line(task_file, task)
 
-def save_tasks(tasks):
-    with open(task_file, 'w') as file:
-        for task in tasks:
-            file.write(task + '\n')
+def pick_task(label, tasks):
+    """Return the index of the chosen task."""
+    if len(tasks) <= SELECTBOX_LIMIT:
+        return st.selectbox(label, range(len(tasks)), format_func=lambda i: f"{i + 1}. {tasks[i]}")
+    number = st.number_input(f"{label} (task number)", min_value=1, max_value=len(tasks), step=1)
+    st.write(f"{number}. {tasks[number - 1]}")
+    return number - 1
 
 if taskbox == 'Add Task':
     add_task = st.text_input('Enter a new task:')
     if st.button("➕ Add Task"):
         if add_task.strip():
-            tasks = load_tasks()
-            tasks.append(add_task.strip())
-            save_tasks(tasks)
+            append_task(add_task.strip())
             st.success("✅ Task added successfully!")
         else:
             st.error("⚠️ Please enter a valid task.")
 
 elif taskbox == 'View Tasks':
-    tasks = load_tasks()
+    tasks, _ = load_tasks()
     if tasks:
         st.markdown(f"### 📋 You have {len(tasks)} task(s):")
-        for i, task in enumerate(tasks, 1):
-            st.write(f"{i}. {task}")
+        # One virtualised table rather than a widget per task.
+        st.dataframe({"Task": tasks})
     else:
         st.info("📭 No tasks found.")
 
 elif taskbox == 'Remove Task':
-    tasks = load_tasks()
+    tasks, version = load_tasks()
     if tasks:
-        task_to_remove = st.selectbox('Select a task to remove:', tasks)
+        index = pick_task('Select a task to remove:', tasks)
         if st.button("🗑️ Remove Task"):
-            tasks = [task for task in tasks if task != task_to_remove]
-            save_tasks(tasks)
-            st.success(f"✅ Task '{task_to_remove}' removed successfully!")
+            task_to_remove = tasks.pop(index)
+            save_tasks(tasks, version, f"✅ Task '{task_to_remove}' removed successfully!")
     else:
         st.info("📭 No tasks to remove.")
 
 elif taskbox == 'Update Task':
-    tasks = load_tasks()
+    tasks, version = load_tasks()
     if tasks:
-        task_to_update = st.selectbox('Select a task to update:', tasks)
+        index = pick_task('Select a task to update:', tasks)
         updated_task = st.text_input('Enter the updated task:')
         if st.button("✏️ Update Task"):
             if updated_task.strip():
-                tasks = [updated_task.strip() if task == task_to_update else task for task in tasks]
-                save_tasks(tasks)
-                st.success(f"✅ Task '{task_to_update}' updated successfully!")
+                task_to_update = tasks[index]
+                tasks[index] = updated_task.strip()
+                save_tasks(tasks, version, f"✅ Task '{task_to_update}' updated successfully!")
             else:
                 st.error("⚠️ Please enter a valid updated task.")
     else:
@@ -1,11 +1,30 @@
-from datetime import datetime
+from datetime import date, datetime
+from itertools import islice
+import csv
+import heapq
+import io
+import json
 import os
+import sys
+import threading
+
+from shared_storage import ENCODING, VersionConflict, read_file, replace_file, update_file, version_of
+from task_cli import CommandError, TaskBackend, run
 
 # Constants
 TASKS_FILE = "tasks.txt"
+FORMAT_HEADER = "#todo-tasks v2 seq="  # first line of tasks.txt: format version + last journal record
+LEGACY_SEQ_HEADER = "#journal-seq="   # header of the unquoted v1 format
+PRIORITIES = ("High", "Medium", "Low")
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(PRIORITIES)}
+JOURNAL_FSYNC_BATCH = 32            # journal records written between fsyncs
+JOURNAL_COMPACT_BYTES = 1 << 20     # rewrite tasks.txt once the journal grows past this
+VIEW_PAGE_SIZE = 20                 # tasks per page, and N for the "next N" views
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # ANSI "cursor home + erase display" instead of spawning cls/clear each loop.
+    sys.stdout.write("\033[H\033[2J")
+    sys.stdout.flush()
 
 def display_menu():
     print("\n---- To-Do List ----"
@@ -16,7 +35,7 @@ def display_menu():
           "\n5. Edit Task"
           "\n6. Exit")
 
-def add_task(tasks):
+def add_task(tasks, journal=None):
     task = input("Enter the task: ")
     deadline = input("Enter the deadline (dd-mm-yyyy) or press Enter to skip: ")
     priority = input("Enter priority (High / Medium / Low): ").capitalize()  # 👈 New priority input
@@ -37,57 +56,114 @@ def add_task(tasks):
         'priority': priority if priority in ["High", "Medium", "Low"] else "Medium"  # 👈 Default to Medium
     }
     tasks.append(task_info)
+    if journal:
+        journal.record('add', task_info=task_info)
     print(f"Task '{task}' added successfully!")
 
+def format_task(idx, task_info):
+    task_status = "[✔]" if task_info['completed'] else "[ ]"
+    deadline = f"(Deadline: {task_info['deadline']})" if task_info['deadline'] else ""
+    priority = f"[Priority: {task_info['priority']}]"  # 👈 Show priority
+    return f"{idx}. {task_status} {task_info['task']} {priority} {deadline}"
+
+def write_tasks(numbered_tasks, footer=None):
+    # One write for the whole listing instead of a print per task.
+    lines = ["", "Your Tasks:"]
+    lines.extend(format_task(idx, task_info) for idx, task_info in numbered_tasks)
+    if footer:
+        lines.append(footer)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def task_page(tasks, page, size=VIEW_PAGE_SIZE):
+    start = (page - 1) * size
+    return [(idx, tasks[idx - 1]) for idx in range(start + 1, min(start + size, len(tasks)) + 1)]
+
+def next_due(tasks, n=VIEW_PAGE_SIZE):
+    pending = ((idx, task_info) for idx, task_info in enumerate(tasks, 1)
+               if task_info['deadline'] and not task_info['completed'])
+    return heapq.nsmallest(n, pending, key=lambda item: item[1]['deadline'])
+
+def top_priority(tasks, n=VIEW_PAGE_SIZE):
+    pending = ((idx, task_info) for idx, task_info in enumerate(tasks, 1) if not task_info['completed'])
+    return heapq.nsmallest(n, pending, key=lambda item: PRIORITY_RANK.get(item[1]['priority'], len(PRIORITIES)))
+
+def search_tasks(tasks, text, n=VIEW_PAGE_SIZE):
+    text = text.lower()
+    return list(islice(((idx, task_info) for idx, task_info in enumerate(tasks, 1)
+                        if text in task_info['task'].lower()), n))
+
 def view_tasks(tasks):
     if not tasks:
         print("No tasks to show!")
         return
-    print("\nYour Tasks:")
-    for idx, task_info in enumerate(tasks, 1):
-        task_status = "[✔]" if task_info['completed'] else "[ ]"
-        deadline = f"(Deadline: {task_info['deadline']})" if task_info['deadline'] else ""
-        priority = f"[Priority: {task_info['priority']}]"  # 👈 Show priority
-        print(f"{idx}. {task_status} {task_info['task']} {priority} {deadline}")
-
-def mark_task_completed(tasks):
+    if len(tasks) <= VIEW_PAGE_SIZE:
+        write_tasks(enumerate(tasks, 1))
+        return
+    pages = (len(tasks) + VIEW_PAGE_SIZE - 1) // VIEW_PAGE_SIZE
+    choice = input(f"Show a page (1-{pages}) [1], 'due' for the next {VIEW_PAGE_SIZE} due, "
+                   f"'top' for the top {VIEW_PAGE_SIZE} by priority or '/text' to search: ").strip().lower()
+    if choice == 'due':
+        write_tasks(next_due(tasks))
+    elif choice == 'top':
+        write_tasks(top_priority(tasks))
+    elif choice.startswith('/'):
+        write_tasks(search_tasks(tasks, choice[1:]), f"(first {VIEW_PAGE_SIZE} matches)")
+    else:
+        page = int(choice) if choice.isdigit() and 0 < int(choice) <= pages else 1
+        write_tasks(task_page(tasks, page), f"(page {page} of {pages}, {len(tasks)} tasks)")
+
+def ask_task_number(tasks, action):
+    """Prompt for a task number; long lists are only listed or searched on request."""
+    if len(tasks) <= VIEW_PAGE_SIZE:
+        write_tasks(enumerate(tasks, 1))
+    while True:
+        answer = input(f"Enter the task number to {action} ('?' to list, '/text' to search): ").strip()
+        if answer == '?':
+            view_tasks(tasks)
+        elif answer.startswith('/'):
+            write_tasks(search_tasks(tasks, answer[1:]))
+        else:
+            return answer
+
+def mark_task_completed(tasks, journal=None):
     if not tasks:
         print("No tasks to mark as completed!")
         return
-    view_tasks(tasks)
-    task_num = input("Enter the task number to mark as completed: ")
+    task_num = ask_task_number(tasks, "mark as completed")
     if task_num.isdigit():
         task_num = int(task_num)
         if 0 < task_num <= len(tasks):
             tasks[task_num - 1]['completed'] = True
+            if journal:
+                journal.record('complete', index=task_num - 1)
             print(f"Task '{tasks[task_num - 1]['task']}' marked as completed!")
         else:
             print("Invalid task number!")
     else:
         print("Please enter a valid number!")
 
-def remove_task(tasks):
+def remove_task(tasks, journal=None):
     if not tasks:
         print("No tasks to remove!")
         return
-    view_tasks(tasks)
     try:
-        task_num = int(input("Enter the task number to remove: "))
+        task_num = int(ask_task_number(tasks, "remove"))
         if 0 < task_num <= len(tasks):
             removed_task = tasks.pop(task_num - 1)
+            if journal:
+                journal.record('remove', index=task_num - 1)
             print(f"Task '{removed_task['task']}' removed successfully!")
         else:
             print("Invalid task number!")
     except ValueError:
         print("Please enter a valid number!")
 
-def edit_task(tasks):
+def edit_task(tasks, journal=None):
     if not tasks:
         print("No tasks to edit!")
         return
-    view_tasks(tasks)
     try:
-        task_num = int(input("Enter the task number to edit: "))
+        task_num = int(ask_task_number(tasks, "edit"))
         if 0 < task_num <= len(tasks):
             current_task = tasks[task_num - 1]
             new_task = input(f"Enter the new task (leave blank to keep '{current_task['task']}'): ")
@@ -105,44 +181,340 @@ def edit_task(tasks):
             if new_priority in ["High", "Medium", "Low"]:
                 current_task['priority'] = new_priority
 
+            if journal:
+                journal.record('edit', index=task_num - 1, task_info=current_task)
             print(f"Task {task_num} edited successfully!")
         else:
             print("Invalid task number!")
     except ValueError:
         print("Please enter a valid number!")
 
-def save_tasks(tasks):
-    with open(TASKS_FILE, "w") as file:
-        for task_info in tasks:
-            task = task_info['task']
-            completed = str(task_info['completed'])
-            deadline = task_info['deadline'].strftime('%d-%m-%Y') if task_info['deadline'] else "None"
-            priority = task_info['priority']
-            file.write(f"{task},{completed},{deadline},{priority}\n")  # 👈 Save priority
+def format_deadline(deadline):
+    return f"{deadline.day:02d}-{deadline.month:02d}-{deadline.year:04d}" if deadline else "None"
+
+def parse_deadline(text, cache=None):
+    """Parse a dd-mm-yyyy deadline ("None" for no deadline).
+
+    Slices the digits directly instead of going through strptime, and
+    reuses earlier results from cache since many tasks share a deadline.
+    """
+    if cache is not None and text in cache:
+        return cache[text]
+    if text == "None" or not text:
+        deadline = None
+    elif len(text) == 10 and text[2] == text[5] == '-':
+        deadline = date(int(text[6:]), int(text[3:5]), int(text[:2]))
+    else:
+        deadline = datetime.strptime(text, '%d-%m-%Y').date()
+    if cache is not None:
+        cache[text] = deadline
+    return deadline
+
+def format_snapshot(tasks, seq=0):
+    buffer = io.StringIO(newline="")
+    buffer.write(f"{FORMAT_HEADER}{seq}\n")
+    # csv quoting keeps commas, quotes and newlines in task text intact.
+    csv.writer(buffer, lineterminator="\n").writerows(
+        (task_info['task'], task_info['completed'], format_deadline(task_info['deadline']), task_info['priority'])
+        for task_info in tasks
+    )
+    return buffer.getvalue()
+
+def save_tasks(tasks, seq=0, expected_version=None, path=TASKS_FILE):
+    """Write a snapshot and return its version.
+
+    Locked against other writers and swapped in whole, so neither a crash
+    nor a concurrent save leaves a half-written tasks.txt behind. With
+    expected_version (as returned by read_snapshot), raise VersionConflict
+    if another process saved the file since.
+    """
+    return replace_file(path, format_snapshot(tasks, seq), expected_version)
+
+def _parse_legacy_line(line, deadlines):
+    # v1 rows were written unquoted, so split from the right: everything
+    # before the last three (or, for the oldest files, two) fields is text.
+    parts = line.rstrip("\n").rsplit(',', 3)
+    if len(parts) == 4 and parts[3] not in PRIORITIES:
+        parts = line.rstrip("\n").rsplit(',', 2)
+    if len(parts) < 3:
+        raise ValueError("expected task,completed,deadline[,priority]")
+    task, completed, deadline = parts[0], parts[1] == 'True', parse_deadline(parts[2], deadlines)
+    priority = parts[3] if len(parts) > 3 else "Medium"
+    return {'task': task, 'completed': completed, 'deadline': deadline, 'priority': priority}
+
+def _parse_row(row, deadlines):
+    if len(row) != 4:
+        raise ValueError(f"expected 4 fields, found {len(row)}")
+    task, completed, deadline, priority = row
+    return {'task': task, 'completed': completed == 'True',
+            'deadline': parse_deadline(deadline, deadlines), 'priority': priority}
+
+def _report_skipped(number, line, error):
+    sys.stderr.write(f"{TASKS_FILE} line {number} skipped ({error}): {line!r}\n")
+
+def parse_snapshot(text):
+    """Return the tasks in the text of tasks.txt, the journal sequence
+    number it is current to, and whether it should be rewritten in the
+    current format.
+
+    Rows that cannot be parsed (hand edits, truncated lines) are reported
+    on stderr and skipped; a legacy file with such rows is left as it is
+    rather than migrated without them.
+    """
+    deadlines = {}
+    tasks = []
+    skipped = False
+    with io.StringIO(text, newline="") as file:
+        header = file.readline()
+        if header.startswith(FORMAT_HEADER):
+            reader = csv.reader(file)
+            for row in reader:
+                try:
+                    tasks.append(_parse_row(row, deadlines))
+                except ValueError as exc:
+                    # +1 for the header line
+                    _report_skipped(reader.line_num + 1, ",".join(row), exc)
+            return tasks, int(header[len(FORMAT_HEADER):]), False
+
+        seq = 0
+        first_line = 1
+        if header.startswith(LEGACY_SEQ_HEADER):
+            seq = int(header[len(LEGACY_SEQ_HEADER):])
+            first_line = 2
+        else:
+            file.seek(0)
+        for number, line in enumerate(file, first_line):
+            if not line.strip():
+                continue
+            try:
+                tasks.append(_parse_legacy_line(line, deadlines))
+            except ValueError as exc:
+                _report_skipped(number, line.rstrip("\n"), exc)
+                skipped = True
+        # Only migrate when there is something to migrate: an empty file
+        # must not be rewritten by a read-only command.
+        return tasks, seq, bool(tasks) and not skipped
+
+def read_snapshot():
+    """parse_snapshot() of tasks.txt, plus the version of the file read.
+
+    A missing file reads as empty.
+    """
+    text, version = read_file(TASKS_FILE)
+    return (*parse_snapshot(text), version)
 
 def load_tasks():
-    if os.path.exists(TASKS_FILE):
-        with open(TASKS_FILE, "r") as file:
-            tasks = []
+    tasks, seq, migrate, version = read_snapshot()
+    if migrate:
+        save_tasks(tasks, seq, version)  # migrate to the current format
+    return tasks
+
+def encode_task(task_info):
+    return dict(task_info, deadline=format_deadline(task_info['deadline']))
+
+def decode_task(data):
+    return dict(data, deadline=parse_deadline(data['deadline']))
+
+class TaskJournal:
+    """Append-only log of task changes on top of the tasks.txt snapshot.
+
+    Every add/complete/remove/edit appends one JSON line, so saving costs
+    O(1) per change and nothing is lost if the program dies before "Exit".
+    Lines are fsynced every JOURNAL_FSYNC_BATCH records. Once the journal
+    passes JOURNAL_COMPACT_BYTES it is rotated to <journal>.old and a
+    background thread rewrites tasks.txt, stamped with the last record it
+    includes, so replay never applies a record twice.
+
+    Snapshots are only written over the version of tasks.txt that was
+    loaded. If another process saved it in the meantime, this session's
+    list goes to tasks.txt.conflict instead: journal records refer to
+    tasks by position, so they cannot be replayed onto a different list.
+    """
+
+    def __init__(self, snapshot_file=TASKS_FILE):
+        self.path = snapshot_file + ".journal"
+        self.old_path = self.path + ".old"
+        self.conflict_path = snapshot_file + ".conflict"
+        self.tasks = []
+        self.seq = 0
+        self.version = None
+        self.conflicted = False
+        self._file = None
+        self._unsynced = 0
+        self._compactor = None
+
+    def read(self):
+        """Load the snapshot and replay the journal onto it without writing
+        anything. Return whether a clean snapshot should be written."""
+        self.tasks, self.seq, migrate, self.version = read_snapshot()
+        snapshot_seq = self.seq
+        replayed = False
+        for path in (self.old_path, self.path):
+            replayed = self._replay(path, snapshot_seq) or replayed
+        return migrate or replayed or os.path.exists(self.old_path)
+
+    def load(self):
+        if self.read():
+            # Migrate an old-format file or recover from an earlier crash
+            # with a clean snapshot.
+            self._write_snapshot([dict(task_info) for task_info in self.tasks], self.seq)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        self._file = open(self.path, "a")
+        return self.tasks
+
+    def _replay(self, path, snapshot_seq):
+        if not os.path.exists(path):
+            return False
+        with open(path, "r") as file:
             for line in file:
-                parts = line.strip().split(',')
-                task = parts[0]
-                completed = parts[1] == 'True'
-                deadline = datetime.strptime(parts[2], '%d-%m-%Y').date() if parts[2] != "None" else None
-                priority = parts[3] if len(parts) > 3 else "Medium"
-                tasks.append({'task': task, 'completed': completed, 'deadline': deadline, 'priority': priority})
-            return tasks
-    return []
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write at the end of the log
+                if entry['seq'] <= snapshot_seq:
+                    continue
+                self._apply(entry)
+                self.seq = entry['seq']
+        return True
+
+    def _apply(self, entry):
+        op = entry['op']
+        if op == 'add':
+            self.tasks.append(decode_task(entry['task']))
+        elif op == 'complete':
+            self.tasks[entry['index']]['completed'] = True
+        elif op == 'remove':
+            self.tasks.pop(entry['index'])
+        elif op == 'edit':
+            self.tasks[entry['index']] = decode_task(entry['task'])
+
+    def record(self, op, index=None, task_info=None):
+        self.seq += 1
+        entry = {'seq': self.seq, 'op': op}
+        if index is not None:
+            entry['index'] = index
+        if task_info is not None:
+            entry['task'] = encode_task(task_info)
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= JOURNAL_FSYNC_BATCH:
+            self.sync()
+        if self._file.tell() >= JOURNAL_COMPACT_BYTES:
+            self._start_compaction()
+
+    def sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _start_compaction(self):
+        if self._compactor and self._compactor.is_alive():
+            return
+        self.sync()
+        self._file.close()
+        os.replace(self.path, self.old_path)
+        self._file = open(self.path, "a")
+        snapshot = [dict(task_info) for task_info in self.tasks]
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(snapshot, self.seq))
+        self._compactor.start()
+
+    def _write_snapshot(self, tasks, seq):
+        try:
+            self.version = save_tasks(tasks, seq, self.version)
+        except VersionConflict:
+            save_tasks(tasks, seq, path=self.conflict_path)
+            self.conflicted = True
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
+
+    def close(self):
+        """Write a final snapshot and drop the journal."""
+        if self._compactor:
+            self._compactor.join()
+        self._file.close()
+        self._write_snapshot(self.tasks, self.seq)
+        os.remove(self.path)
+        if self.conflicted:
+            print(f"{TASKS_FILE} was changed by another program while this session was open; "
+                  f"your tasks were saved to {self.conflict_path} instead.")
+
+class BatchBackend(TaskBackend):
+    """task_cli commands over tasks.txt: changes are applied in memory and
+    written as one snapshot at the end instead of being journaled.
+
+    The journal of an open or crashed menu session is replayed but left in
+    place. If another process saved tasks.txt since load(), update_file
+    hands over its version and this run's changes are re-applied to it,
+    so concurrent runs never overwrite each other.
+    """
+
+    def load(self):
+        journal = TaskJournal()
+        journal.read()
+        self.tasks, self.seq, self.version = journal.tasks, journal.seq, journal.version
+        self.changes = []
+
+    def save(self):
+        update_file(TASKS_FILE, self._updated_snapshot)
+
+    def _updated_snapshot(self, text):
+        if version_of(text.encode(ENCODING)) == self.version:
+            return format_snapshot(self.tasks, self.seq)
+        tasks, seq, _ = parse_snapshot(text)
+        for op, index, task_info in self.changes:
+            if op == 'add':
+                tasks.append(dict(task_info))
+                continue
+            # Numbers refer to the list this run loaded; only act on the
+            # same task, never on whatever moved into its place.
+            if index >= len(tasks) or tasks[index] != task_info:
+                raise CommandError(f"task {index + 1} was changed by another program, nothing was saved")
+            if op == 'complete':
+                tasks[index] = dict(task_info, completed=True)
+            else:
+                del tasks[index]
+        return format_snapshot(tasks, max(seq, self.seq))
+
+    def record(self, task_info):
+        deadline = task_info['deadline']
+        return {'description': task_info['task'], 'completed': task_info['completed'],
+                'due_date': deadline.isoformat() if deadline else None, 'priority': task_info['priority']}
+
+    def records(self):
+        return [self.record(task_info) for task_info in self.tasks]
+
+    def add(self, description, due_date=None, priority="Medium", completed=False):
+        task_info = {'task': description, 'completed': completed,
+                     'deadline': date.fromisoformat(due_date) if due_date else None, 'priority': priority}
+        self.tasks.append(task_info)
+        self.changes.append(('add', None, dict(task_info)))
+        return self.record(task_info)
+
+    def complete(self, number):
+        index = self.check_number(number, len(self.tasks))
+        task_info = self.tasks[index]
+        self.changes.append(('complete', index, dict(task_info)))
+        task_info['completed'] = True
+        return self.record(task_info)
+
+    def remove(self, number):
+        index = self.check_number(number, len(self.tasks))
+        self.changes.append(('remove', index, dict(self.tasks[index])))
+        return self.record(self.tasks.pop(index))
 
 def main():
-    tasks = load_tasks()
+    if len(sys.argv) > 1:
+        sys.exit(run(BatchBackend(), prog="To_do.py"))
+    journal = TaskJournal()
+    tasks = journal.load()
     menu_options = {
-        "1": add_task,
-        "2": view_tasks,
-        "3": mark_task_completed,
-        "4": remove_task,
-        "5": edit_task,
-        "6": lambda tasks: [print("Saving tasks and exiting To-Do List. Goodbye!"), save_tasks(tasks), exit()]
+        "1": lambda: add_task(tasks, journal),
+        "2": lambda: view_tasks(tasks),
+        "3": lambda: mark_task_completed(tasks, journal),
+        "4": lambda: remove_task(tasks, journal),
+        "5": lambda: edit_task(tasks, journal),
+        "6": lambda: [print("Saving tasks and exiting To-Do List. Goodbye!"), journal.close(), exit()]
     }
 
     while True:
@@ -150,7 +522,7 @@ def main():
         display_menu()
         choice = input("Enter your choice: ")
         if choice in menu_options:
-            menu_optionschoice
+            menu_options[choice]()
         else:
             print("Invalid choice! Please try again.")
 
@@ -0,0 +1,311 @@
+"""Time the To-Do scripts' task storage against what it replaced.
+
+    python bench_cli.py journal --sizes 100000 1000000
+    python bench_cli.py format --sizes 1000000
+    python bench_cli.py storage --sizes 10000 100000
+    python bench_cli.py stream --sizes 1000000
+    python bench_cli.py memory --sizes 100000
+    python bench_cli.py stats --sizes 100000 1000000
+
+Every suite runs in a temporary directory, so the task files next to the
+scripts are never touched. Latencies are printed as p50/p99 over
+``--repeat`` runs; memory is measured with tracemalloc.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import task_stats
+import To_do
+from To_Do_OOPS import JSONStorage, SQLiteStorage, Task, ToDoList
+
+PRIORITIES = ("High", "Medium", "Low")
+WORDS = (
+    "write report review budget call plan meeting fix deploy email invoice "
+    "groceries dentist gym read book clean garage update docs refactor test"
+).split()
+# Journal records timed one by one; every JOURNAL_FSYNC_BATCH-th pays an fsync.
+JOURNAL_RECORDS = 1000
+# Rewriting the whole file per add makes sequential adds quadratic; past
+# this many the JSON backends are only timed per add.
+JSON_SEQUENTIAL_LIMIT = 1000
+
+
+def measure(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, round(len(samples) * 0.99))]
+
+
+def peak_memory(function):
+    """Peak traced allocation while function runs, formatted in MB."""
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return f'peak {peak / 2 ** 20:10.1f} MB'
+
+
+def retained_memory(build, count):
+    """Traced memory still held by what build() returns, per task."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return f'held {current / count:10.0f} bytes per task'
+
+
+def generate_task_infos(count, rng):
+    """To_do.py tasks: about a third completed, most with a deadline within a year."""
+    today = date.today().toordinal()
+    return [{
+        'task': " ".join(rng.choices(WORDS, k=4)),
+        'completed': rng.random() < 0.3,
+        'deadline': date.fromordinal(today + rng.randint(-180, 180)) if rng.random() < 0.8 else None,
+        'priority': rng.choice(PRIORITIES),
+    } for _ in range(count)]
+
+
+def generate_tasks(count, rng):
+    """To_Do_OOPS.py tasks, shaped like generate_task_infos()."""
+    return [Task(task_info['task'], task_info['deadline'] and task_info['deadline'].isoformat(),
+                 task_info['priority'], task_info['completed'])
+            for task_info in generate_task_infos(count, rng)]
+
+
+def legacy_save_tasks(tasks):
+    """To_do.py's save on exit before the journal: unquoted CSV, rewritten whole."""
+    with open(To_do.TASKS_FILE, "w") as file:
+        for task_info in tasks:
+            deadline = task_info['deadline'].strftime('%d-%m-%Y') if task_info['deadline'] else "None"
+            file.write(f"{task_info['task']},{task_info['completed']},{deadline},{task_info['priority']}\n")
+
+
+def legacy_load_tasks():
+    """To_do.py's load before the v2 format: split(',') and strptime per row."""
+    with open(To_do.TASKS_FILE, "r") as file:
+        tasks = []
+        for line in file:
+            parts = line.strip().split(',')
+            deadline = datetime.strptime(parts[2], '%d-%m-%Y').date() if parts[2] != "None" else None
+            tasks.append({'task': parts[0], 'completed': parts[1] == 'True', 'deadline': deadline,
+                          'priority': parts[3] if len(parts) > 3 else "Medium"})
+        return tasks
+
+
+class LegacyTask:
+    """To_Do_OOPS.py's Task before lazy loading and __slots__: string fields in a __dict__."""
+
+    def __init__(self, description, due_date=None, priority="Medium", completed=False):
+        self.description = description
+        self.due_date = due_date
+        self.priority = priority
+        self.completed = completed
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.id = None
+
+    @classmethod
+    def from_dict(cls, data):
+        task = cls(data["description"])
+        task.due_date = data["due_date"]
+        task.priority = data["priority"]
+        task.completed = data["completed"]
+        task.created_at = data["created_at"]
+        return task
+
+
+def legacy_statistics(tasks):
+    """ToDoList.show_statistics before compute_stats: a pass per count, strptime per due date."""
+    total_tasks = len(tasks)
+    completed_tasks = sum(1 for task in tasks if task.completed)
+    overdue_tasks = sum(1 for task in tasks if task.due_date and not task.completed and
+                        datetime.strptime(task.due_date, "%Y-%m-%d").date() < datetime.now().date())
+    return total_tasks, completed_tasks, total_tasks - completed_tasks, overdue_tasks
+
+
+def legacy_json_load(filename):
+    """JSONStorage.load before streaming: json.load, then a Task per element."""
+    with open(filename, "r") as file:
+        return [LegacyTask.from_dict(task_data) for task_data in json.load(file)]
+
+
+class LegacyJSONStorage(JSONStorage):
+    """ToDoList.save_tasks before pluggable storage: json.dump of the whole list."""
+
+    def save_all(self, tasks):
+        with open(self.filename, "w") as file:
+            json.dump([task.to_dict() for task in tasks], file, indent=2)
+
+
+def add_one(todo_list):
+    todo_list.add("benchmark task", "2030-01-01", "High")
+
+
+def sequential_adds(storage, count):
+    todo_list = ToDoList(storage)
+    for _ in range(count):
+        add_one(todo_list)
+    storage.close()
+
+
+def storage_suite(size, repeat, rng):
+    tasks = generate_tasks(size, rng)
+    names = itertools.count()
+    backends = (
+        ('json.dump, indent=2 (before)', lambda: LegacyJSONStorage(f"tasks{next(names)}.json")),
+        ('JSONStorage', lambda: JSONStorage(f"tasks{next(names)}.json")),
+        ('SQLiteStorage', lambda: SQLiteStorage(f"tasks{next(names)}.db")),
+    )
+    results = []
+    for name, make_storage in backends:
+        storage = make_storage()
+        storage.save_all(tasks)
+        todo_list = ToDoList(storage)
+        results.append((f'one add to {size} tasks, {name}', measure(lambda: add_one(todo_list), repeat)))
+        storage.close()
+    for name, make_storage in backends:
+        if size <= JSON_SEQUENTIAL_LIMIT or name == 'SQLiteStorage':
+            results.append((f'{size} adds from empty, {name}',
+                             measure(lambda: sequential_adds(make_storage(), size), 1)))
+    return results
+
+
+def stats_suite(size, repeat, rng):
+    tasks = generate_tasks(size, rng)
+    legacy_tasks = [LegacyTask.from_dict(task.to_dict()) for task in tasks]
+    todo_list = ToDoList(JSONStorage("tasks.json"))
+    todo_list.tasks = tasks
+    columns = ([task.completed for task in tasks], [task.due_ordinal or task_stats.NO_DUE_DATE for task in tasks],
+               [task.priority for task in tasks])
+    today = date.today().toordinal()
+    results = [
+        ('overdue via strptime, a pass per count (before)', measure(lambda: legacy_statistics(legacy_tasks), repeat)),
+        ('ToDoList.statistics(), all buckets', measure(todo_list.statistics, repeat)),
+    ]
+    if task_stats.np is not None:
+        results.append(('compute_stats on columns, NumPy', measure(lambda: task_stats.compute_stats(*columns), repeat)))
+    results.append(('compute_stats on columns, pure Python',
+                    measure(lambda: task_stats._python_stats(*columns, None, today), repeat)))
+    return results
+
+
+def memory_suite(size, repeat, rng):
+    storage = JSONStorage("tasks.json")
+    storage.save_all(generate_tasks(size, rng))
+    with open(storage.filename, "r") as file:
+        text = file.read()
+    # Each build parses the file itself, so only what the tasks keep is counted.
+    return [
+        ('Task with __dict__ and string dates (before)',
+         retained_memory(lambda: [LegacyTask.from_dict(data) for data in json.loads(text)], size)),
+        ('Task with __slots__, ordinals, priority codes',
+         retained_memory(lambda: [Task.from_dict(data) for data in json.loads(text)], size)),
+        ('LazyTaskList entry, not yet accessed', retained_memory(storage.load, size)),
+        ('Task.from_dict per element (before)',
+         measure(lambda: [LegacyTask.from_dict(data) for data in json.loads(text)], repeat)),
+        ('Task.from_dict per element, slotted',
+         measure(lambda: [Task.from_dict(data) for data in json.loads(text)], repeat)),
+    ]
+
+
+def stream_suite(size, repeat, rng):
+    storage = JSONStorage("tasks.json")
+    storage.save_all(generate_tasks(size, rng))
+    legacy_load = lambda: legacy_json_load(storage.filename)
+    return [
+        ('startup, json.load + Task per element (before)', measure(legacy_load, repeat)),
+        ('startup, json.load + Task per element (before)', peak_memory(legacy_load)),
+        ('startup, streamed into LazyTaskList', measure(storage.load, repeat)),
+        ('startup, streamed into LazyTaskList', peak_memory(storage.load)),
+    ]
+
+
+def format_suite(size, repeat, rng):
+    tasks = generate_task_infos(size, rng)
+    legacy_save_tasks(tasks)
+    with open(To_do.TASKS_FILE, "r") as file:
+        legacy_text = file.read()
+    results = [
+        ('load, split + strptime (before)', measure(legacy_load_tasks, repeat)),
+        ('parse v1 file for migration (cached deadlines)', measure(lambda: To_do.parse_snapshot(legacy_text), repeat)),
+    ]
+    To_do.save_tasks(tasks)
+    results += [
+        ('load v2 file (csv, cached deadlines)', measure(To_do.read_snapshot, repeat)),
+        ('format v2 snapshot', measure(lambda: To_do.format_snapshot(tasks), repeat)),
+    ]
+    return results
+
+
+def journal_suite(size, repeat, rng):
+    tasks = generate_task_infos(size, rng)
+    results = [('save on exit, CSV rewrite (before)', measure(lambda: legacy_save_tasks(tasks), repeat))]
+    results.append(('load, split + strptime (before)', measure(legacy_load_tasks, repeat)))
+
+    To_do.save_tasks(tasks)
+    journal = To_do.TaskJournal()
+    journal.load()
+    indexes = iter(rng.sample(range(size), min(size, JOURNAL_RECORDS)))
+    results.append(('one change, journal record', measure(
+        lambda: journal.record('complete', index=next(indexes)), min(size, JOURNAL_RECORDS))))
+    journal.sync()
+    # A session that never reached "Exit": the snapshot plus a journal to replay.
+    results.append((f'load, snapshot + {min(size, JOURNAL_RECORDS)} journal records',
+                    measure(lambda: To_do.TaskJournal().read(), repeat)))
+    results.append(('snapshot save (exit, compaction)', measure(lambda: To_do.save_tasks(journal.tasks), repeat)))
+    journal._file.close()
+    return results
+
+
+SUITES = {
+    'format': format_suite,
+    'journal': journal_suite,
+    'memory': memory_suite,
+    'stats': stats_suite,
+    'storage': storage_suite,
+    'stream': stream_suite,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print p50/p99 latencies of the To-Do scripts' storage.")
+    parser.add_argument('suite', choices=sorted(SUITES))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case')
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args(argv)
+
+    suite = SUITES[options.suite]
+    rng = random.Random(options.seed)
+    cwd = os.getcwd()
+    for size in sorted(options.sizes):
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                print(f'{size} tasks')
+                for name, result in suite(size, options.repeat, rng):
+                    if isinstance(result, tuple):
+                        result = f'p50 {result[0]:10.2f} ms   p99 {result[1]:10.2f} ms'
+                    print(f'  {name:<52} {result}')
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Safe shared access to a task file from several processes.
+
+Writers take an exclusive advisory lock on "<file>.lock". Rewrites swap
+in a complete new file with os.replace, and appends are one write at the
+end of the file, so readers never need the lock or wait for each other.
+Read-modify-write callers pass the version they read and get
+VersionConflict if another writer got in first, instead of silently
+overwriting that writer's change.
+
+On platforms without fcntl (Windows) writes are still atomic, but are
+not serialised against each other.
+"""
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ENCODING = "utf-8"
+UPDATE_RETRIES = 100
+
+
+class VersionConflict(Exception):
+    """The file changed between reading it and writing it back."""
+
+
+def version_of(data):
+    """Version token for file contents: equal tokens mean equal bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@contextmanager
+def write_lock(path):
+    with open(path + ".lock", "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_bytes(path):
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return b""
+
+
+def read_file(path):
+    """Return (text, version) of the file; a missing file reads as empty."""
+    data = _read_bytes(path)
+    return data.decode(ENCODING), version_of(data)
+
+
+def _write_atomic(path, data):
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def replace_file(path, text, expected_version=None):
+    """Replace the file's contents and return the new version.
+
+    With expected_version, raise VersionConflict unless the file still has
+    that version.
+    """
+    data = text.encode(ENCODING)
+    with write_lock(path):
+        if expected_version is not None and version_of(_read_bytes(path)) != expected_version:
+            raise VersionConflict(path)
+        _write_atomic(path, data)
+    return version_of(data)
+
+
+def create_file(path, text):
+    """Create the file with text unless it exists; return whether it was
+    created. Of several processes creating the same file, one writes it."""
+    data = text.encode(ENCODING)
+    with write_lock(path):
+        if os.path.exists(path):
+            return False
+        _write_atomic(path, data)
+    return True
+
+
+def append_line(path, line):
+    """Append one line. Appends cannot lose other writers' changes, so
+    there is no version check."""
+    with write_lock(path):
+        with open(path, "ab") as file:
+            prefix = b""
+            if file.tell():
+                with open(path, "rb") as current:
+                    current.seek(-1, os.SEEK_END)
+                    if current.read(1) != b"\n":
+                        # Files edited by hand may lack the final newline.
+                        prefix = b"\n"
+            file.write(prefix + line.encode(ENCODING) + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def update_file(path, modify, retries=UPDATE_RETRIES):
+    """Apply modify(text) -> new text, re-reading and retrying on conflicts."""
+    for _ in range(retries):
+        text, version = read_file(path)
+        try:
+            return replace_file(path, modify(text), version)
+        except VersionConflict:
+            continue
+    raise VersionConflict(path)
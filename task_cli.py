@@ -0,0 +1,225 @@
+"""Non-interactive command interface shared by the To-Do scripts.
+
+Each script passes a TaskBackend for its own task store; running the
+script with arguments applies them here instead of opening the menu:
+
+    python To_do.py add "Pay rent" --due 2025-07-01 --priority High
+    python To_do.py batch nightly.txt      # one command per line, '-' for stdin
+
+Every command prints one JSON object per line. The store is loaded once
+before the first command and saved once after the last.
+"""
+import argparse
+import json
+import shlex
+import sys
+from contextlib import nullcontext
+from datetime import date
+
+from task_stats import NO_DUE_DATE, compute_stats
+
+PRIORITIES = ("High", "Medium", "Low")
+# Commands after which the store is saved, even if they failed part-way.
+MUTATING_COMMANDS = {"add", "done", "rm", "import"}
+
+
+class CommandError(Exception):
+    pass
+
+
+class TaskBackend:
+    """Adapter between the commands and one script's task store.
+
+    Tasks are exchanged as records: {"description", "completed",
+    "due_date" (YYYY-MM-DD or None), "priority"}. Numbers are 1-based
+    positions, as shown by the interactive menus.
+    """
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self):
+        raise NotImplementedError
+
+    def records(self):
+        raise NotImplementedError
+
+    def add(self, description, due_date=None, priority="Medium", completed=False):
+        raise NotImplementedError
+
+    def complete(self, number):
+        raise NotImplementedError
+
+    def remove(self, number):
+        raise NotImplementedError
+
+    def close(self):
+        """Called after every run, whether or not save() was."""
+
+    def check_number(self, number, count):
+        if not 0 < number <= count:
+            raise CommandError(f"no task number {number}")
+        return number - 1
+
+    def stats(self):
+        records = self.records()
+        return compute_stats([record["completed"] for record in records],
+                             [date.fromisoformat(record["due_date"]).toordinal() if record["due_date"] else NO_DUE_DATE
+                              for record in records],
+                             [record["priority"] for record in records])
+
+
+class _Parser(argparse.ArgumentParser):
+    # Raise instead of exiting so one bad line in a batch does not end the run.
+    def error(self, message):
+        raise CommandError(message)
+
+
+def _due_date(text):
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {text!r}, expected YYYY-MM-DD")
+
+
+def _priority(text):
+    priority = text.capitalize()
+    if priority not in PRIORITIES:
+        raise argparse.ArgumentTypeError(f"priority must be one of {', '.join(PRIORITIES)}")
+    return priority
+
+
+def build_parser(prog=None):
+    parser = _Parser(prog=prog, description="Run To-Do List commands without the interactive menu.")
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=_Parser)
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("description")
+    add.add_argument("--due", type=_due_date, help="due date, YYYY-MM-DD")
+    add.add_argument("--priority", type=_priority, default="Medium")
+
+    done = commands.add_parser("done", help="mark tasks as completed")
+    done.add_argument("numbers", type=int, nargs="+")
+
+    rm = commands.add_parser("rm", help="remove tasks (numbers as listed before this command)")
+    rm.add_argument("numbers", type=int, nargs="+")
+
+    ls = commands.add_parser("ls", help="list tasks")
+    ls.add_argument("--pending", action="store_true", help="only tasks not yet completed")
+
+    import_ = commands.add_parser("import", help="add the tasks of a JSON array of task records")
+    import_.add_argument("file", help="'-' for stdin")
+
+    export = commands.add_parser("export", help="write all tasks as a JSON array")
+    export.add_argument("file", nargs="?", default="-", help="'-' (default) for the command output")
+
+    commands.add_parser("stats", help="task statistics")
+
+    batch = commands.add_parser("batch", help="run one command per line of a file")
+    batch.add_argument("file", help="'-' for stdin")
+    return parser
+
+
+def _open(path):
+    return nullcontext(sys.stdin) if path == "-" else open(path, "r")
+
+
+def _numbered(records):
+    return [dict(record, number=number) for number, record in enumerate(records, 1)]
+
+
+def _execute(backend, args):
+    """Run one parsed command and return its result fields."""
+    if args.command == "add":
+        record = backend.add(args.description, args.due, args.priority)
+        return {"task": record}
+    if args.command == "done":
+        return {"tasks": [backend.complete(number) for number in args.numbers]}
+    if args.command == "rm":
+        # Highest first, so each number still refers to the listing the caller saw.
+        removed = [backend.remove(number) for number in sorted(set(args.numbers), reverse=True)]
+        return {"tasks": removed[::-1]}
+    if args.command == "ls":
+        records = _numbered(backend.records())
+        if args.pending:
+            records = [record for record in records if not record["completed"]]
+        return {"tasks": records}
+    if args.command == "import":
+        with _open(args.file) as file:
+            data = json.load(file)
+        if not isinstance(data, list):
+            raise CommandError("import expects a JSON array of tasks")
+        for record in data:
+            try:
+                backend.add(record["description"], _due_date(record["due_date"]) if record.get("due_date") else None,
+                            _priority(record.get("priority") or "Medium"), bool(record.get("completed")))
+            except (KeyError, TypeError, argparse.ArgumentTypeError) as exc:
+                raise CommandError(f"invalid task record {record!r}: {exc}")
+        return {"count": len(data)}
+    if args.command == "export":
+        records = backend.records()
+        if args.file == "-":
+            return {"tasks": records}
+        with open(args.file, "w") as file:
+            json.dump(records, file, indent=2)
+        return {"file": args.file, "count": len(records)}
+    if args.command == "stats":
+        return {"stats": backend.stats()}
+    raise CommandError(f"unknown command {args.command!r}")
+
+
+def _batch_lines(path):
+    with _open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def run(backend, argv=None, prog=None, out=None):
+    """Apply the command in argv (or the batch it names) and return an exit status."""
+    out = out or sys.stdout
+    parser = build_parser(prog)
+    try:
+        args = parser.parse_args(argv)
+        if args.command == "batch":
+            commands = [(line, None) for line in _batch_lines(args.file)]
+        else:
+            commands = [(None, args)]
+    except (CommandError, OSError) as exc:
+        out.write(json.dumps({"ok": False, "error": str(exc)}) + "\n")
+        return 2
+
+    try:
+        backend.load()
+    except Exception as exc:
+        # A corrupt or unreadable store can fail in many ways (bad JSON,
+        # malformed rows, a damaged database); callers still get one JSON line.
+        out.write(json.dumps({"ok": False, "error": f"cannot load tasks: {exc}"}) + "\n")
+        return 2
+    changed = False
+    failed = False
+    for line, args in commands:
+        result = {"line": line} if line is not None else {}
+        try:
+            if args is None:
+                args = parser.parse_args(shlex.split(line))
+                if args.command == "batch":
+                    raise CommandError("batch files cannot run other batches")
+            result["command"] = args.command
+            changed = changed or args.command in MUTATING_COMMANDS
+            result.update(_execute(backend, args), ok=True)
+        except (CommandError, OSError, ValueError) as exc:
+            failed = True
+            result.update(ok=False, error=str(exc))
+        out.write(json.dumps(result) + "\n")
+    try:
+        if changed:
+            backend.save()
+    except Exception as exc:
+        # e.g. a change that no longer applies after a concurrent save.
+        out.write(json.dumps({"ok": False, "error": f"cannot save tasks: {exc}"}) + "\n")
+        return 2
+    finally:
+        backend.close()
+    return 1 if failed else 0
@@ -0,0 +1,112 @@
+"""Task statistics computed in a single pass over columnar task data.
+
+Uses NumPy when it is installed and a plain Python loop otherwise; both
+return the same dictionary.
+"""
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Due-date buckets, shared with the Django app's tasks/stats.py: a pending
+# task is overdue from the day after its due date, due today on it and due
+# soon on the DUE_SOON_DAYS days after today. Completed tasks are in none.
+DUE_SOON_DAYS = 7
+NO_DUE_DATE = 0    # day ordinals start at 1, so 0 marks a task without a due date
+
+
+def _breakdown_entry():
+    return {"total": 0, "completed": 0}
+
+
+def _finish(totals, by_priority, by_category):
+    total = totals["total"]
+    completed = totals["completed"]
+    stats = dict(totals)
+    stats["pending"] = total - completed
+    stats["completion_rate"] = round(completed / total * 100, 2) if total else 0.0
+    stats["by_priority"] = by_priority
+    if by_category is not None:
+        stats["by_category"] = by_category
+    return stats
+
+
+def _python_stats(completed, due, priority, category, today):
+    soon_end = today + DUE_SOON_DAYS
+    totals = dict.fromkeys(("total", "completed", "overdue", "due_today", "due_soon", "due_later", "no_due_date"), 0)
+    by_priority = {}
+    by_category = None if category is None else {}
+    rows = zip(completed, due, priority, category) if category is not None else zip(completed, due, priority)
+    for row in rows:
+        done, day, label = row[0], row[1], row[2]
+        totals["total"] += 1
+        entry = by_priority.get(label)
+        if entry is None:
+            entry = by_priority[label] = _breakdown_entry()
+        entry["total"] += 1
+        if by_category is not None:
+            category_entry = by_category.get(row[3])
+            if category_entry is None:
+                category_entry = by_category[row[3]] = _breakdown_entry()
+            category_entry["total"] += 1
+        if done:
+            totals["completed"] += 1
+            entry["completed"] += 1
+            if by_category is not None:
+                category_entry["completed"] += 1
+        elif day == NO_DUE_DATE:
+            totals["no_due_date"] += 1
+        elif day < today:
+            totals["overdue"] += 1
+        elif day == today:
+            totals["due_today"] += 1
+        elif day <= soon_end:
+            totals["due_soon"] += 1
+        else:
+            totals["due_later"] += 1
+    return _finish(totals, by_priority, by_category)
+
+
+def _grouped_counts(labels, done):
+    # Labels may be any hashable (None included), so they are numbered in
+    # first-seen order rather than sorted by np.unique.
+    codes = {}
+    inverse = np.fromiter((codes.setdefault(label, len(codes)) for label in labels), dtype=np.intp, count=done.size)
+    totals = np.bincount(inverse, minlength=len(codes))
+    completed = np.bincount(inverse, weights=done, minlength=len(codes))
+    return {key: {"total": int(count), "completed": int(finished)}
+            for key, count, finished in zip(codes, totals, completed)}
+
+
+def _numpy_stats(completed, due, priority, category, today):
+    done = np.asarray(completed, dtype=bool)
+    days = np.asarray(due, dtype=np.int64)
+    pending = ~done
+    has_due = days != NO_DUE_DATE
+    totals = {
+        "total": int(done.size),
+        "completed": int(np.count_nonzero(done)),
+        "overdue": int(np.count_nonzero(pending & has_due & (days < today))),
+        "due_today": int(np.count_nonzero(pending & (days == today))),
+        "due_soon": int(np.count_nonzero(pending & (days > today) & (days <= today + DUE_SOON_DAYS))),
+        "due_later": int(np.count_nonzero(pending & (days > today + DUE_SOON_DAYS))),
+        "no_due_date": int(np.count_nonzero(pending & ~has_due)),
+    }
+    by_priority = _grouped_counts(priority, done)
+    by_category = None if category is None else _grouped_counts(category, done)
+    return _finish(totals, by_priority, by_category)
+
+
+def compute_stats(completed, due, priority, category=None, today=None):
+    """Summarise tasks given as parallel columns.
+
+    ``completed`` holds booleans, ``due`` day ordinals (``NO_DUE_DATE`` when
+    unset) and ``priority``/``category`` hashable labels. The due-date
+    buckets (see DUE_SOON_DAYS) only count pending tasks.
+    """
+    today = (today or date.today()).toordinal()
+    if np is not None:
+        return _numpy_stats(completed, due, priority, category, today)
+    return _python_stats(completed, due, priority, category, today)
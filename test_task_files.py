@@ -0,0 +1,179 @@
+"""Tests for the To-Do scripts' task files and statistics.
+
+    python -m unittest test_task_files
+"""
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import task_stats
+import To_do
+from To_do import BatchBackend, TaskJournal, read_snapshot
+from To_Do_OOPS import JSON_CHUNK_SIZE, JSONStorage, Task, ToDoList, iter_json_array
+from shared_storage import create_file
+from task_cli import CommandError, run
+
+WRITERS = 32
+ROUNDS = 10
+
+
+def _writer(directory, writer, barrier):
+    os.chdir(directory)
+    barrier.wait()
+    statuses = [run(BatchBackend(), ["add", f"writer {writer} task {number}"], out=io.StringIO())
+                for number in range(ROUNDS)]
+    os._exit(max(statuses))
+
+
+def _creator(directory, writer, barrier):
+    os.chdir(directory)
+    barrier.wait()
+    os._exit(0 if create_file("app_tasks.txt", f"writer {writer}\n") else 1)
+
+
+class TaskFileTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+
+    def descriptions(self):
+        return [task_info['task'] for task_info in read_snapshot()[0]]
+
+    def command(self, *argv):
+        return run(BatchBackend(), list(argv), out=io.StringIO())
+
+
+class ConcurrentWriterTests(TaskFileTestCase):
+    def test_no_update_is_lost(self):
+        barrier = multiprocessing.Barrier(WRITERS)
+        writers = [multiprocessing.Process(target=_writer, args=(self.directory, writer, barrier))
+                   for writer in range(WRITERS)]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join()
+        self.assertEqual([process.exitcode for process in writers], [0] * WRITERS)
+        self.assertCountEqual(self.descriptions(), [f"writer {writer} task {number}"
+                                                    for writer in range(WRITERS) for number in range(ROUNDS)])
+
+    def test_changes_are_reapplied_to_a_newer_version(self):
+        self.command("add", "first")
+        backend = BatchBackend()
+        backend.load()
+        backend.complete(1)
+        backend.add("mine")
+        self.command("add", "theirs")
+        backend.save()
+        tasks = read_snapshot()[0]
+        self.assertEqual([(task_info['task'], task_info['completed']) for task_info in tasks],
+                         [("first", True), ("theirs", False), ("mine", False)])
+
+    def test_change_to_a_moved_task_is_refused(self):
+        self.command("add", "first")
+        self.command("add", "second")
+        backend = BatchBackend()
+        backend.load()
+        backend.remove(1)
+        self.command("rm", "1")
+        with self.assertRaisesRegex(CommandError, "changed by another program"):
+            backend.save()
+        self.assertEqual(self.descriptions(), ["second"])
+
+
+class CreateFileTests(TaskFileTestCase):
+    def test_only_one_creator_writes(self):
+        barrier = multiprocessing.Barrier(WRITERS)
+        creators = [multiprocessing.Process(target=_creator, args=(self.directory, writer, barrier))
+                    for writer in range(WRITERS)]
+        for process in creators:
+            process.start()
+        for process in creators:
+            process.join()
+        exitcodes = [process.exitcode for process in creators]
+        self.assertEqual(sorted(exitcodes), [0] + [1] * (WRITERS - 1))
+        with open("app_tasks.txt") as file:
+            self.assertEqual(file.read(), f"writer {exitcodes.index(0)}\n")
+
+
+class MenuSessionTests(TaskFileTestCase):
+    def test_concurrent_save_is_not_overwritten(self):
+        journal = TaskJournal()
+        tasks = journal.load()
+        tasks.append({'task': "menu", 'completed': False, 'deadline': None, 'priority': "Medium"})
+        journal.record('add', task_info=tasks[-1])
+        self.command("add", "batch")
+        journal.close()
+        # The batch run replayed the open session's journal, then saved.
+        self.assertEqual(self.descriptions(), ["menu", "batch"])
+        with open(To_do.TASKS_FILE + ".conflict") as file:
+            self.assertIn("menu", file.read())
+
+    def test_read_only_command_leaves_an_empty_file_alone(self):
+        open(To_do.TASKS_FILE, "w").close()
+        self.assertEqual(self.command("ls"), 0)
+        self.assertEqual(os.path.getsize(To_do.TASKS_FILE), 0)
+
+
+class JSONArrayTests(unittest.TestCase):
+    def parse(self, text, chunk_size):
+        return list(iter_json_array(io.StringIO(text), chunk_size))
+
+    def test_malformed_arrays_are_rejected(self):
+        for text in ("", "[1 2]", "[,,1]", "[1,,2]", "[1,]", "[,]", "[1", "[1] 2", "{}"):
+            for chunk_size in (1, JSON_CHUNK_SIZE):
+                with self.subTest(text=text, chunk_size=chunk_size), self.assertRaises(ValueError):
+                    self.parse(text, chunk_size)
+
+    def test_elements_split_across_chunks(self):
+        for text in ("[]", " [ ] ", json.dumps([12345, 1e5, "a,]b", {"x": [1, 2]}, None, "y" * 100], indent=2)):
+            for chunk_size in (1, 2, 7, JSON_CHUNK_SIZE):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(self.parse(text, chunk_size), json.loads(text))
+
+
+class SortedViewTests(TaskFileTestCase):
+    def test_numbers_follow_adds_and_removes(self):
+        JSONStorage().save_all([Task("c", "2025-03-01"), Task("a", "2025-01-01"), Task("b", "2025-02-01")])
+        todo_list = ToDoList(JSONStorage())
+        self.assertEqual([(number, task.description) for number, task in todo_list.sorted_tasks("date", 0, 1)],
+                         [(2, "a")])
+        # Only the task shown was loaded as a Task.
+        self.assertEqual(sum(isinstance(entry, Task) for entry in todo_list.tasks._entries), 1)
+        todo_list.remove(0)
+        todo_list.add("d", "2025-01-15")
+        self.assertEqual([(number, task.description) for number, task in todo_list.sorted_tasks("date")],
+                         [(1, "a"), (3, "d"), (2, "b")])
+
+
+class DueBucketTests(unittest.TestCase):
+    # Same cases as TaskStatsTests.test_due_buckets_go_by_calendar_day in the Django app.
+    def test_buckets_go_by_calendar_day(self):
+        today = date(2026, 3, 11)
+        day = today.toordinal()
+        tasks = [
+            (False, day),        # due today
+            (False, day - 1),    # overdue
+            (True, day - 1),     # completed and overdue
+            (False, day + 7),    # exactly 7 days out
+            (False, day + 8),
+            (False, task_stats.NO_DUE_DATE),
+        ]
+        completed, due = zip(*tasks)
+        expected = {"completed": 1, "overdue": 1, "due_today": 1, "due_soon": 1, "due_later": 1, "no_due_date": 1}
+        for numpy in (task_stats.np, None):
+            with self.subTest(numpy=numpy is not None), mock.patch.object(task_stats, "np", numpy):
+                stats = task_stats.compute_stats(completed, due, ["Medium"] * len(tasks), today=today)
+                self.assertEqual({bucket: stats[bucket] for bucket in expected}, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,7 @@
+import sys
+
+from task_cli import CommandError, TaskBackend, run
+
 class ToDoList:
     def __init__(self):
         self.tasks = []
@@ -21,7 +25,42 @@ class ToDoList:
         except IndexError:
             print("Invalid task number.")
 
+class BatchBackend(TaskBackend):
+    """task_cli commands over an in-memory ToDoList.
+
+    Nothing is stored between runs, so this is mostly useful for batches
+    that import, list and export in one go. Tasks are plain text: no due
+    date, priority or completion.
+    """
+
+    def load(self):
+        self.todo_list = ToDoList()
+
+    def save(self):
+        pass
+
+    def record(self, task):
+        return {"description": task, "completed": False, "due_date": None, "priority": "Medium"}
+
+    def records(self):
+        return [self.record(task) for task in self.todo_list.tasks]
+
+    def add(self, description, due_date=None, priority="Medium", completed=False):
+        if due_date or priority != "Medium" or completed:
+            raise CommandError("to_do_list.py tasks are plain text: due dates, priorities "
+                               "and completion are not supported")
+        self.todo_list.tasks.append(description)
+        return self.record(description)
+
+    def complete(self, number):
+        raise CommandError("to_do_list.py does not track completed tasks")
+
+    def remove(self, number):
+        return self.record(self.todo_list.tasks.pop(self.check_number(number, len(self.todo_list.tasks))))
+
 def main():
+    if len(sys.argv) > 1:
+        sys.exit(run(BatchBackend(), prog="to_do_list.py"))
     todo_list = ToDoList()
 
     while True: